@@ -0,0 +1,23 @@
+"""
+Optional numba support.
+
+Import njit/prange from this module so numeric kernels get real JIT
+compilation when numba is installed and a transparent no-op fallback
+(plain Python / NumPy) when it is not.
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        # Support both @njit and @njit(...) usage
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def wrap(func):
+            return func
+        return wrap
@@ -3,17 +3,21 @@ FastAPI server for historical trade data and analytics endpoints.
 Provides REST API for querying user trades, portfolio history, and analytics.
 """
 
-from fastapi import FastAPI, HTTPException, Depends, Query
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from cachetools import TTLCache
+import hashlib
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import func, desc, case, select
 from typing import List, Optional
 from datetime import datetime, timedelta
 from database import get_db, Trade, Position, PortfolioSnapshot, User
 from pydantic import BaseModel
-import json
 
-app = FastAPI(title="Trading Bot API", version="1.0.0")
+# orjson handles datetime/float natively and is several times faster than the
+# default json encoder on the larger trade/analytics payloads
+app = FastAPI(title="Trading Bot API", version="1.0.0", default_response_class=ORJSONResponse)
 
 # CORS middleware
 app.add_middleware(
@@ -83,6 +87,17 @@ class OverallAnalytics(BaseModel):
     largest_loss: float
     unique_tokens_traded: int
 
+# Analytics results only change when a trade is written, so cache them keyed
+# on a cheap "last trade activity" fingerprint and let dashboards revalidate
+# with ETag / If-None-Match instead of re-aggregating on every poll
+_analytics_cache = TTLCache(maxsize=1024, ttl=60)
+
+def _analytics_etag(wallet_address: str, db: Session) -> str:
+    count, last_entry, last_exit = db.query(
+        func.count(Trade.id), func.max(Trade.entry_time), func.max(Trade.exit_time)
+    ).filter(Trade.wallet_address == wallet_address).one()
+    return hashlib.sha1(f"{wallet_address}:{count}:{last_entry}:{last_exit}".encode()).hexdigest()
+
 # Endpoints
 
 @app.get("/")
@@ -145,10 +160,18 @@ def get_trade_detail(wallet_address: str, trade_id: int, db: Session = Depends(g
 @app.get("/api/positions/{wallet_address}", response_model=List[PositionResponse])
 def get_positions(wallet_address: str, db: Session = Depends(get_db)):
     """Get current open positions for a wallet"""
-    positions = db.query(Position).filter(
-        Position.wallet_address == wallet_address
+    # Project only the response columns; with the covering index on
+    # positions this resolves as an index-only scan with no ORM hydration
+    rows = db.execute(
+        select(
+            Position.token_symbol,
+            Position.token_address,
+            Position.tokens,
+            Position.cost_basis,
+            Position.last_updated
+        ).where(Position.wallet_address == wallet_address)
     ).all()
-    return positions
+    return [row._mapping for row in rows]
 
 @app.get("/api/portfolio/history/{wallet_address}")
 def get_portfolio_history(
@@ -158,52 +181,65 @@ def get_portfolio_history(
 ):
     """Get portfolio value history over time"""
     since = datetime.utcnow() - timedelta(days=days)
-    
-    snapshots = db.query(PortfolioSnapshot).filter(
-        PortfolioSnapshot.wallet_address == wallet_address,
-        PortfolioSnapshot.timestamp >= since
-    ).order_by(PortfolioSnapshot.timestamp).all()
-    
+
+    # Project only the columns the response needs as lightweight Row tuples;
+    # no PortfolioSnapshot ORM instances are built. yield_per streams rows in
+    # chunks rather than materializing the whole history at once.
+    result = db.execute(
+        select(
+            PortfolioSnapshot.timestamp,
+            PortfolioSnapshot.sol_balance,
+            PortfolioSnapshot.total_value,
+            PortfolioSnapshot.overall_pnl
+        ).where(
+            PortfolioSnapshot.wallet_address == wallet_address,
+            PortfolioSnapshot.timestamp >= since
+        ).order_by(PortfolioSnapshot.timestamp)
+    ).yield_per(1000)
+
     return [{
-        "timestamp": s.timestamp,
-        "sol_balance": s.sol_balance,
-        "total_value": s.total_value,
-        "overall_pnl": s.overall_pnl
-    } for s in snapshots]
+        "timestamp": timestamp,
+        "sol_balance": sol_balance,
+        "total_value": total_value,
+        "overall_pnl": overall_pnl
+    } for timestamp, sol_balance, total_value, overall_pnl in result]
 
 @app.get("/api/analytics/{wallet_address}/overall", response_model=OverallAnalytics)
-def get_overall_analytics(wallet_address: str, db: Session = Depends(get_db)):
+def get_overall_analytics(wallet_address: str, request: Request = None, response: Response = None, db: Session = Depends(get_db)):
     """Get overall trading analytics for a wallet"""
-    # Get all finished trades
-    finished_trades = db.query(Trade).filter(
-        Trade.wallet_address == wallet_address,
-        Trade.status == 'finished'
-    ).all()
-    
-    active_trades_count = db.query(func.count(Trade.id)).filter(
-        Trade.wallet_address == wallet_address,
-        Trade.status == 'active'
-    ).scalar()
-    
-    total_trades = len(finished_trades)
-    wins = sum(1 for t in finished_trades if t.pnl_sol and t.pnl_sol > 0)
-    losses = sum(1 for t in finished_trades if t.pnl_sol and t.pnl_sol <= 0)
+    etag = _analytics_etag(wallet_address, db)
+    if request is not None and request.headers.get('if-none-match') == etag:
+        return Response(status_code=304)
+    if response is not None:
+        response.headers['ETag'] = etag
+    cached = _analytics_cache.get(('overall', wallet_address, etag))
+    if cached is not None:
+        return cached
+    # One aggregate query over all of this wallet's trades: per-status
+    # buckets via conditional sums, so no trade rows are hydrated
+    finished = Trade.status == 'finished'
+    (total_trades, active_trades_count, wins, losses, total_volume,
+     total_pnl, largest_win, largest_loss, unique_tokens) = db.query(
+        func.sum(case((finished, 1), else_=0)),
+        func.sum(case((Trade.status == 'active', 1), else_=0)),
+        func.sum(case(((finished) & (Trade.pnl_sol > 0), 1), else_=0)),
+        func.sum(case(((finished) & (Trade.pnl_sol <= 0), 1), else_=0)),
+        func.coalesce(func.sum(case((finished, Trade.sol_invested), else_=0.0)), 0.0),
+        func.coalesce(func.sum(case((finished, Trade.pnl_sol), else_=0.0)), 0.0),
+        func.coalesce(func.max(case((finished, Trade.pnl_sol))), 0.0),
+        func.coalesce(func.min(case((finished, Trade.pnl_sol))), 0.0),
+        func.count(func.distinct(Trade.token_address))
+    ).filter(Trade.wallet_address == wallet_address).one()
+
+    total_trades = total_trades or 0
+    active_trades_count = active_trades_count or 0
+    wins = wins or 0
+    losses = losses or 0
     win_rate = (wins / total_trades * 100) if total_trades > 0 else 0.0
-    
-    total_volume = sum(t.sol_invested for t in finished_trades)
-    total_pnl = sum(t.pnl_sol for t in finished_trades if t.pnl_sol)
     avg_trade_size = total_volume / total_trades if total_trades > 0 else 0.0
     avg_pnl = total_pnl / total_trades if total_trades > 0 else 0.0
     
-    pnls = [t.pnl_sol for t in finished_trades if t.pnl_sol is not None]
-    largest_win = max(pnls) if pnls else 0.0
-    largest_loss = min(pnls) if pnls else 0.0
-    
-    unique_tokens = db.query(func.count(func.distinct(Trade.token_address))).filter(
-        Trade.wallet_address == wallet_address
-    ).scalar()
-    
-    return OverallAnalytics(
+    result = OverallAnalytics(
         total_trades=total_trades + active_trades_count,
         active_trades=active_trades_count,
         finished_trades=total_trades,
@@ -218,48 +254,51 @@ def get_overall_analytics(wallet_address: str, db: Session = Depends(get_db)):
         largest_loss=largest_loss,
         unique_tokens_traded=unique_tokens
     )
+    _analytics_cache[('overall', wallet_address, etag)] = result
+    return result
 
 @app.get("/api/analytics/{wallet_address}/by-token", response_model=List[TokenAnalytics])
-def get_token_analytics(wallet_address: str, db: Session = Depends(get_db)):
+def get_token_analytics(wallet_address: str, request: Request = None, response: Response = None, db: Session = Depends(get_db)):
     """Get per-token analytics for a wallet"""
-    # Query finished trades grouped by token
-    trades_by_token = db.query(Trade).filter(
+    etag = _analytics_etag(wallet_address, db)
+    if request is not None and request.headers.get('if-none-match') == etag:
+        return Response(status_code=304)
+    if response is not None:
+        response.headers['ETag'] = etag
+    cached = _analytics_cache.get(('by-token', wallet_address, etag))
+    if cached is not None:
+        return cached
+    # Aggregate finished trades in SQL: one GROUP BY query instead of
+    # hydrating every trade row and re-aggregating in Python
+    net_pnl = func.coalesce(func.sum(Trade.pnl_sol), 0.0)
+    rows = db.query(
+        Trade.token_address,
+        Trade.token_symbol,
+        func.count(Trade.id),
+        func.sum(case((Trade.pnl_sol > 0, 1), else_=0)),
+        func.sum(case((Trade.pnl_sol <= 0, 1), else_=0)),
+        func.coalesce(func.sum(Trade.sol_invested), 0.0),
+        func.coalesce(func.sum(Trade.sol_returned), 0.0),
+        net_pnl,
+        func.coalesce(func.avg(Trade.pnl_percent), 0.0),
+        func.coalesce(func.max(Trade.pnl_sol), 0.0),
+        func.coalesce(func.min(Trade.pnl_sol), 0.0)
+    ).filter(
         Trade.wallet_address == wallet_address,
         Trade.status == 'finished'
-    ).all()
-    
-    # Group trades by token
-    token_map = {}
-    for trade in trades_by_token:
-        if trade.token_address not in token_map:
-            token_map[trade.token_address] = {
-                'symbol': trade.token_symbol,
-                'trades': []
-            }
-        token_map[trade.token_address]['trades'].append(trade)
-    
-    # Calculate analytics per token
+    ).group_by(
+        Trade.token_address, Trade.token_symbol
+    ).order_by(desc(net_pnl)).all()
+
     analytics = []
-    for token_addr, data in token_map.items():
-        trades = data['trades']
-        total_trades = len(trades)
-        wins = sum(1 for t in trades if t.pnl_sol and t.pnl_sol > 0)
-        losses = sum(1 for t in trades if t.pnl_sol and t.pnl_sol <= 0)
+    for (token_addr, symbol, total_trades, wins, losses, total_invested,
+         total_returned, pnl, avg_pnl_percent, best_trade, worst_trade) in rows:
+        wins = wins or 0
+        losses = losses or 0
         win_rate = (wins / total_trades * 100) if total_trades > 0 else 0.0
-        
-        total_invested = sum(t.sol_invested for t in trades)
-        total_returned = sum(t.sol_returned for t in trades if t.sol_returned)
-        net_pnl = sum(t.pnl_sol for t in trades if t.pnl_sol)
-        
-        pnl_percents = [t.pnl_percent for t in trades if t.pnl_percent is not None]
-        avg_pnl_percent = sum(pnl_percents) / len(pnl_percents) if pnl_percents else 0.0
-        
-        pnls = [t.pnl_sol for t in trades if t.pnl_sol is not None]
-        best_trade = max(pnls) if pnls else 0.0
-        worst_trade = min(pnls) if pnls else 0.0
-        
+
         analytics.append(TokenAnalytics(
-            token_symbol=data['symbol'],
+            token_symbol=symbol,
             token_address=token_addr,
             total_trades=total_trades,
             wins=wins,
@@ -267,14 +306,13 @@ def get_token_analytics(wallet_address: str, db: Session = Depends(get_db)):
             win_rate=win_rate,
             total_invested=total_invested,
             total_returned=total_returned,
-            net_pnl=net_pnl,
+            net_pnl=pnl,
             avg_pnl_percent=avg_pnl_percent,
             best_trade_pnl=best_trade,
             worst_trade_pnl=worst_trade
         ))
-    
-    # Sort by net P&L descending
-    analytics.sort(key=lambda x: x.net_pnl, reverse=True)
+
+    _analytics_cache[('by-token', wallet_address, etag)] = analytics
     return analytics
 
 if __name__ == "__main__":
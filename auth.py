@@ -4,18 +4,19 @@ Generates random wallet addresses and assigns initial SOL balance between 10-20
 """
 
 import random
-import string
+import secrets
 from datetime import datetime
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from database import User, SessionLocal
 import config
 
 def generate_synthetic_wallet_address() -> str:
     """Generate a synthetic Solana-like wallet address (base58 format simulation)"""
-    # Solana addresses are 32-44 characters in base58 encoding
-    # For synthetic purposes, we'll generate a 44-character alphanumeric string
-    chars = string.ascii_letters + string.digits
-    return ''.join(random.choice(chars) for _ in range(44))
+    # Solana addresses are 32-44 characters in base58 encoding.
+    # secrets.token_urlsafe gives 256+ bits of entropy in one call, so
+    # collisions are effectively impossible and no pre-insert lookup is needed
+    return secrets.token_urlsafe(33).replace('-', 'a').replace('_', 'b')[:44]
 
 def generate_initial_sol_balance() -> float:
     """Generate random SOL balance between MIN and MAX with decimal precision"""
@@ -30,23 +31,23 @@ def register_synthetic_wallet(db: Session) -> dict:
     Register a new synthetic wallet with random address and SOL balance.
     Returns dict with wallet_address and initial_sol_balance.
     """
-    wallet_address = generate_synthetic_wallet_address()
     initial_balance = generate_initial_sol_balance()
-    
-    # Check for collision (extremely unlikely but safe)
-    existing = db.query(User).filter(User.wallet_address == wallet_address).first()
-    if existing:
-        # Try again recursively
-        return register_synthetic_wallet(db)
-    
-    # Create new user
-    user = User(
-        wallet_address=wallet_address,
-        created_at=datetime.utcnow(),
-        initial_sol_balance=initial_balance
-    )
-    db.add(user)
-    db.commit()
+
+    # No pre-insert existence check: the address space makes collisions
+    # effectively impossible, and the primary key catches the freak case
+    while True:
+        wallet_address = generate_synthetic_wallet_address()
+        user = User(
+            wallet_address=wallet_address,
+            created_at=datetime.utcnow(),
+            initial_sol_balance=initial_balance
+        )
+        db.add(user)
+        try:
+            db.commit()
+            break
+        except IntegrityError:
+            db.rollback()
     db.refresh(user)
     
     print(f"✅ Registered new synthetic wallet: {wallet_address[:8]}... with {initial_balance} SOL")
@@ -57,6 +58,17 @@ def register_synthetic_wallet(db: Session) -> dict:
         "created_at": user.created_at.isoformat()
     }
 
+def wallet_exists(wallet_address: str, db: Session) -> bool:
+    """
+    Membership test for a wallet address.
+    Emits SELECT EXISTS(...) returning a single bool instead of hydrating
+    a full User row — use this when the caller doesn't need the user object.
+    """
+    exists_q = db.query(User.wallet_address).filter(
+        User.wallet_address == wallet_address
+    ).exists()
+    return db.query(exists_q).scalar()
+
 def authenticate_wallet(wallet_address: str, db: Session) -> User | None:
     """
     Authenticate a wallet address (check if it exists in database).
@@ -21,8 +21,12 @@ TAKE_PROFIT_TIERS = [
 INITIAL_STOP_LOSS_PERCENT = 0.15   # 15% below entry price
 TRAILING_STOP_LOSS_PERCENT = 0.20  # Trail 20% below the highest price reached
 
+# Console Output
+VERBOSE = True  # Set False to silence per-trade console output in tick loops
+
 # Data Simulation Parameters
 SIM_INITIAL_PRICE = 0.01
 SIM_DRIFT = 0.001       # Positive drift to simulate a general uptrend
 SIM_VOLATILITY = 0.02   # Volatility to create price fluctuations
-SIM_TIME_STEPS = 1000    # Number of price updates in our simulation
\ No newline at end of file
+SIM_TIME_STEPS = 1000    # Number of price updates in our simulation
+SIM_TICK_INTERVAL = 0.05  # Seconds between simulated ticks; 0 runs backtests at full speed
\ No newline at end of file
@@ -1,61 +1,215 @@
+import math
+from functools import lru_cache
 import numpy as np
 import pandas as pd
 import asyncio
-import random 
 
-def generate_synthetic_data(initial_price, drift, volatility, time_steps):
+# Single per-module Generator: one PRNG stream for every draw in this module,
+# reproducible via seed() and safe to use per-instance across threads
+RNG = np.random.default_rng()
+
+def seed(value):
+    """Re-seed the module RNG for reproducible simulations."""
+    global RNG, _NORMAL_POOL
+    RNG = np.random.default_rng(value)
+    _NORMAL_POOL = np.empty(0)
+
+# Standard-normal pool for hot loops that need one sample per tick: a scalar
+# Generator call pays dispatch and float boxing every time (a few µs), while
+# refilling 4096 draws at once amortizes that to almost nothing.
+_NORMAL_POOL = np.empty(0)
+_NORMAL_POOL_IDX = 0
+
+def next_normal(loc=0.0, scale=1.0) -> float:
+    """One normal sample served from a preallocated pool of draws."""
+    global _NORMAL_POOL, _NORMAL_POOL_IDX
+    i = _NORMAL_POOL_IDX
+    if i >= _NORMAL_POOL.shape[0]:
+        _NORMAL_POOL = RNG.standard_normal(4096)
+        i = 0
+    _NORMAL_POOL_IDX = i + 1
+    return loc + scale * float(_NORMAL_POOL[i])
+
+# Numba is optional: when available we JIT the GBM kernels, otherwise we fall
+# back to the plain vectorized NumPy paths.
+from _njit import njit, prange, NUMBA_AVAILABLE
+
+
+@njit(cache=True, fastmath=True)
+def _gbm_path(out, initial_price, drift, volatility, n):
+    """Fill `out` with a GBM price path, fusing the cumsum and exp into one pass."""
+    acc = 0.0
+    for i in range(n):
+        acc += np.random.normal(drift, volatility)
+        out[i] = initial_price * math.exp(acc)
+
+
+@njit(cache=True, fastmath=True)
+def _ohlcv_kernel(out_open, out_high, out_low, out_close, out_volume,
+                  initial_price, drift, volatility, n):
+    """One fused pass producing all five OHLCV columns — GBM walk, wick
+    draws and volumes share a single loop with no full-size temporaries."""
+    acc = 0.0
+    prev_close = initial_price
+    for i in range(n):
+        acc += np.random.normal(drift, volatility)
+        close = initial_price * math.exp(acc)
+        open_ = prev_close
+        body_high = open_ if open_ > close else close
+        body_low = open_ if open_ < close else close
+        out_open[i] = open_
+        out_close[i] = close
+        out_high[i] = body_high * np.random.uniform(1.0, 1.015)
+        out_low[i] = body_low * np.random.uniform(0.985, 1.0)
+        out_volume[i] = np.random.randint(1000, 20001)
+        prev_close = close
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _gbm_paths(out, initial_price, drift, volatility, n_paths, n_steps):
+    """Fill `out` (n_paths x n_steps) with independent GBM paths, one per row."""
+    for p in prange(n_paths):
+        acc = 0.0
+        for t in range(n_steps):
+            acc += np.random.normal(drift, volatility)
+            out[p, t] = initial_price * math.exp(acc)
+
+
+def generate_paths(n_paths, time_steps, initial_price, drift, volatility):
     """
-    Generates realistic synthetic OHLCV data for candlestick charts.
+    Batched GBM simulation for Monte Carlo workloads: returns an
+    (n_paths, time_steps) array of price paths. With numba the paths are
+    generated in parallel across cores; single-path callers use out[0].
     """
-    # 1. Generate a series of close prices using Geometric Brownian Motion
-    shocks = np.random.normal(loc=drift, scale=volatility, size=time_steps)
-    close_prices = initial_price * np.exp(np.cumsum(shocks))
-    
-    # 2. Build OHLCV data from the close prices
-    ohlcv = []
-    for i in range(len(close_prices)):
-        if i == 0:
-            open_price = initial_price
-        else:
-            # The open of this candle is the close of the last one
-            open_price = ohlcv[i-1]['close']
+    out = np.empty((n_paths, time_steps), dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        _gbm_paths(out, initial_price, drift, volatility, n_paths, time_steps)
+    else:
+        shocks = RNG.normal(drift, volatility, size=(n_paths, time_steps))
+        out[:] = initial_price * np.exp(np.cumsum(shocks, axis=1))
+    return out
+
+
+@lru_cache(maxsize=8)
+def generate_price_path(initial_price, drift, volatility, time_steps):
+    """
+    Cached close-price path for the given sim params, as a read-only float64
+    array. Monitoring tasks with identical params share one array (views,
+    no regeneration); use seed() + cache_clear() for fresh paths.
+    """
+    if NUMBA_AVAILABLE:
+        prices = np.empty(time_steps)
+        _gbm_path(prices, initial_price, drift, volatility, time_steps)
+    else:
+        shocks = RNG.normal(loc=drift, scale=volatility, size=time_steps)
+        prices = initial_price * np.exp(np.cumsum(shocks))
+    # Shared across tasks — guard against accidental mutation
+    prices.setflags(write=False)
+    return prices
+
 
-        close_price = close_prices[i]
+async def stream_prices(prices, interval=0.05):
+    """
+    Asynchronously yields raw floats from a price array — the tick loop
+    counterpart of stream_data for consumers that only need the close.
+    """
+    for price in prices:
+        yield float(price)
+        if interval:
+            await asyncio.sleep(interval)
+
+
+# Matches the DataFrame variant's index: 5-minute candles from 2023-01-01 UTC
+_SIM_EPOCH_START = 1_672_531_200
+_SIM_CANDLE_SECONDS = 300
+
+def generate_synthetic_arrays(initial_price, drift, volatility, time_steps):
+    """
+    Generates synthetic OHLCV data as parallel NumPy arrays:
+    (epoch_seconds, open, high, low, close, volume). Streaming consumers
+    iterate these directly — no DataFrame/BlockManager is built.
+    """
+    if NUMBA_AVAILABLE:
+        # One fused jitted loop fills all five columns into preallocated
+        # buffers; wick multipliers keep high/low outside the candle body,
+        # so no clamp pass is needed.
+        open_prices = np.empty(time_steps)
+        high_prices = np.empty(time_steps)
+        low_prices = np.empty(time_steps)
+        close_prices = np.empty(time_steps)
+        volumes = np.empty(time_steps, dtype=np.int64)
+        _ohlcv_kernel(open_prices, high_prices, low_prices, close_prices, volumes,
+                      initial_price, drift, volatility, time_steps)
+    else:
+        # 1. Generate a series of close prices using Geometric Brownian Motion
+        shocks = RNG.normal(loc=drift, scale=volatility, size=time_steps)
+        close_prices = initial_price * np.exp(np.cumsum(shocks))
+
+        # 2. Build OHLCV columns as whole arrays (no per-row Python loop).
+        # The open of each candle is the close of the previous one.
+        open_prices = np.empty_like(close_prices)
+        open_prices[0] = initial_price
+        open_prices[1:] = close_prices[:-1]
 
         # Create realistic wicks
-        high_price = max(open_price, close_price) * random.uniform(1, 1.015)
-        low_price = min(open_price, close_price) * random.uniform(0.985, 1)
-        
+        high_prices = np.maximum(open_prices, close_prices) * RNG.uniform(1, 1.015, time_steps)
+        low_prices = np.minimum(open_prices, close_prices) * RNG.uniform(0.985, 1, time_steps)
+
         # Ensure open/close are within high/low
-        high_price = max(high_price, open_price, close_price)
-        low_price = min(low_price, open_price, close_price)
+        high_prices = np.maximum.reduce([high_prices, open_prices, close_prices])
+        low_prices = np.minimum.reduce([low_prices, open_prices, close_prices])
 
         # Generate some volume
-        volume = random.randint(1000, 20000)
-
-        ohlcv.append({
-            'open': open_price,
-            'high': high_price,
-            'low': low_price,
-            'close': close_price,
-            'volume': volume
-        })
-
-    # 3. Create the final DataFrame
-    timestamps = pd.to_datetime(pd.date_range(start='2023-01-01', periods=time_steps, freq='5min'))
-    df = pd.DataFrame(ohlcv)
-    df['timestamp'] = timestamps
-    
+        volumes = RNG.integers(1000, 20001, time_steps)
+
+    epoch = _SIM_EPOCH_START + _SIM_CANDLE_SECONDS * np.arange(time_steps, dtype=np.int64)
+    return epoch, open_prices, high_prices, low_prices, close_prices, volumes
+
+
+def generate_synthetic_data(initial_price, drift, volatility, time_steps):
+    """
+    Generates realistic synthetic OHLCV data for candlestick charts, as a
+    DataFrame. Thin wrapper over generate_synthetic_arrays for callers that
+    want pandas; hot streaming paths should use the arrays directly.
+    """
+    epoch, open_prices, high_prices, low_prices, close_prices, volumes = \
+        generate_synthetic_arrays(initial_price, drift, volatility, time_steps)
+    df = pd.DataFrame({
+        'open': open_prices,
+        'high': high_prices,
+        'low': low_prices,
+        'close': close_prices,
+        'volume': volumes
+    })
+    # Keep the historical datetime64[ns] dtype (to_datetime with unit='s'
+    # would yield second resolution on pandas 2.x)
+    df['timestamp'] = pd.to_datetime(epoch * 1_000_000_000)
+
     return df
 
-async def stream_data(data_df):
+async def stream_data(data_df, batch=1, interval=0.05):
     """
-    An asynchronous generator that yields data points one by one,
-    simulating a real-time data feed.
+    An asynchronous generator that simulates a real-time data feed.
+
+    With the defaults it yields rows one by one with a 50ms pause, as
+    before. Backtests can pass batch>1 (yielding dicts of column-array
+    slices) and interval=0 to replay hours of candles in seconds while
+    keeping the async interface.
     """
-    for index, row in data_df.iterrows():
-        yield row
-        await asyncio.sleep(0.05) # This will now work correctly
+    if batch <= 1:
+        # itertuples avoids building a new Series per row; consumers read
+        # columns as namedtuple attributes (row.close) instead of row['close']
+        for row in data_df.itertuples(index=False, name='Row'):
+            yield row
+            if interval:
+                await asyncio.sleep(interval)
+        return
+
+    arrays = {column: data_df[column].to_numpy() for column in data_df.columns}
+    for i in range(0, len(data_df), batch):
+        yield {column: arr[i:i + batch] for column, arr in arrays.items()}
+        if interval:
+            await asyncio.sleep(interval)
 
 # This part is for standalone testing of this file
 if __name__ == '__main__':
@@ -73,6 +227,6 @@ if __name__ == '__main__':
 
     async def run_test_stream():
         async for price_update in stream_data(test_data):
-            print(f"Time: {price_update['timestamp'].time()}, Price: {price_update['price']:.6f}")
+            print(f"Time: {price_update.timestamp.time()}, Price: {price_update.close:.6f}")
     
     asyncio.run(run_test_stream())
\ No newline at end of file
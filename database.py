@@ -3,7 +3,7 @@ Database models and setup for multi-user trading bot.
 Tracks users, trades, positions, and portfolio snapshots.
 """
 
-from sqlalchemy import create_engine, Column, String, Float, Integer, DateTime, Boolean, Text, ForeignKey
+from sqlalchemy import create_engine, Column, String, Float, Integer, DateTime, Boolean, Text, ForeignKey, Index, JSON, func, insert
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime
@@ -19,17 +19,26 @@ class User(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     initial_sol_balance = Column(Float, nullable=False)
     
-    # Relationships
-    trades = relationship("Trade", back_populates="user", cascade="all, delete-orphan")
-    positions = relationship("Position", back_populates="user", cascade="all, delete-orphan")
-    portfolio_snapshots = relationship("PortfolioSnapshot", back_populates="user", cascade="all, delete-orphan")
+    # Relationships. No endpoint traverses these collections from a User
+    # query today, so lazy='raise' turns any accidental per-object lazy load
+    # (a silent N+1) into an immediate error; callers that really want the
+    # collection must opt in with selectinload().
+    trades = relationship("Trade", back_populates="user", cascade="all, delete-orphan", lazy='raise')
+    positions = relationship("Position", back_populates="user", cascade="all, delete-orphan", lazy='raise')
+    portfolio_snapshots = relationship("PortfolioSnapshot", back_populates="user", cascade="all, delete-orphan", lazy='raise')
 
 class Trade(Base):
     """Individual trade record with full entry/exit details"""
     __tablename__ = 'trades'
-    
+    # Composite indexes matching the API access patterns: filter on
+    # (wallet, status) ordered by entry_time, and filter on (wallet, token)
+    __table_args__ = (
+        Index('ix_trades_wallet_status_entry', 'wallet_address', 'status', 'entry_time'),
+        Index('ix_trades_wallet_token', 'wallet_address', 'token_address'),
+    )
+
     id = Column(Integer, primary_key=True, autoincrement=True)
-    wallet_address = Column(String(100), ForeignKey('users.wallet_address'), nullable=False, index=True)
+    wallet_address = Column(String(100), ForeignKey('users.wallet_address'), nullable=False)
     
     # Token details
     token_address = Column(String(100), nullable=False, index=True)
@@ -55,7 +64,7 @@ class Trade(Base):
     
     # Strategy parameters
     stop_loss_price = Column(Float, nullable=True)
-    take_profit_tiers = Column(Text, nullable=True)  # JSON string
+    take_profit_tiers = Column(JSON, nullable=True)  # serialized once per flush by the backend codec
     highest_price_seen = Column(Float, nullable=True)
     
     # Sentiment data
@@ -71,9 +80,18 @@ class Trade(Base):
 class Position(Base):
     """Current open positions per user per token"""
     __tablename__ = 'positions'
-    
+    # Covering index for the dashboard positions poll: every column the
+    # endpoint projects is in the index, so the query is an index-only scan.
+    # The unique (wallet, symbol) index backs the per-trade position upsert
+    # lookup and guarantees one row per holding.
+    __table_args__ = (
+        Index('ix_positions_wallet_symbol', 'wallet_address', 'token_symbol', unique=True),
+        Index('ix_positions_wallet_covering', 'wallet_address', 'token_symbol',
+              'token_address', 'tokens', 'cost_basis', 'last_updated'),
+    )
+
     id = Column(Integer, primary_key=True, autoincrement=True)
-    wallet_address = Column(String(100), ForeignKey('users.wallet_address'), nullable=False, index=True)
+    wallet_address = Column(String(100), ForeignKey('users.wallet_address'), nullable=False)
     token_address = Column(String(100), nullable=False, index=True)
     token_symbol = Column(String(50), nullable=False)
     
@@ -90,7 +108,9 @@ class PortfolioSnapshot(Base):
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     wallet_address = Column(String(100), ForeignKey('users.wallet_address'), nullable=False, index=True)
-    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+    # DB-side default so bulk/Core inserts get timestamps without a Python
+    # value per row; explicit timestamps still override it
+    timestamp = Column(DateTime, default=datetime.utcnow, server_default=func.now(), index=True)
     
     sol_balance = Column(Float, nullable=False)
     total_value = Column(Float, nullable=False)
@@ -101,13 +121,49 @@ class PortfolioSnapshot(Base):
 
 # Database setup
 engine = create_engine(config.DATABASE_URL, echo=False)
+
+if engine.dialect.name == 'sqlite':
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, _connection_record):
+        # WAL lets the read-heavy API endpoints run concurrently with trade
+        # writes instead of serializing on the writer lock, and
+        # synchronous=NORMAL drops the per-commit fsync cost
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-64000")
+        cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def init_db():
     """Initialize database tables"""
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist, so indexes declared after
+    # a database was first created never materialize on it. Create any that
+    # are missing — the position upsert relies on the unique (wallet, symbol)
+    # index being present.
+    with engine.begin() as conn:
+        for table in Base.metadata.tables.values():
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
     print("✅ Database initialized successfully")
 
+def bulk_insert_snapshots(db, rows):
+    """
+    Insert many portfolio snapshots in one Core statement.
+    `rows` is a list of dicts with wallet_address/sol_balance/total_value/
+    overall_pnl (timestamp is filled by the DB default when omitted).
+    Skips unit-of-work tracking, so it is much faster than add_all().
+    """
+    if not rows:
+        return
+    db.execute(insert(PortfolioSnapshot), rows)
+    db.commit()
+
 def get_db():
     """Dependency for getting database session"""
     db = SessionLocal()
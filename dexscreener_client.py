@@ -0,0 +1,63 @@
+"""
+Lightweight DexScreener REST client.
+
+Polls the public pair endpoint over a pooled aiohttp session instead of
+scraping the rendered page with a headless browser — one HTTP round-trip
+per poll and no chromium process.
+"""
+
+import asyncio
+import aiohttp
+
+DEXSCREENER_PAIR_URL = "https://api.dexscreener.com/latest/dex/pairs/solana/{pair_address}"
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+async def fetch_pair(pair_address: str, session: aiohttp.ClientSession) -> dict | None:
+    """Fetches the current pair snapshot (price, volume, txn counts) or None."""
+    url = DEXSCREENER_PAIR_URL.format(pair_address=pair_address)
+    try:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            if response.status != 200:
+                return None
+            payload = await response.json()
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        return None
+
+    pairs = payload.get('pairs') or []
+    return pairs[0] if pairs else payload.get('pair')
+
+
+async def stream_pair_updates(pair_address: str, interval: float = DEFAULT_POLL_INTERVAL,
+                              session: aiohttp.ClientSession = None):
+    """
+    Async generator yielding a pair snapshot whenever it changes.
+
+    Successive identical snapshots (same price and txn counters) are
+    de-duplicated, mirroring the processed-row set of the old scraper.
+    """
+    owns_session = session is None
+    if owns_session:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=10, ttl_dns_cache=300)
+        )
+
+    last_fingerprint = None
+    try:
+        while True:
+            pair = await fetch_pair(pair_address, session)
+            if pair is not None:
+                txns = pair.get('txns', {})
+                fingerprint = (
+                    pair.get('priceUsd'),
+                    pair.get('priceNative'),
+                    str(txns.get('h24')),
+                    str(txns.get('h1')),
+                )
+                if fingerprint != last_fingerprint:
+                    last_fingerprint = fingerprint
+                    yield pair
+            await asyncio.sleep(interval)
+    finally:
+        if owns_session:
+            await session.close()
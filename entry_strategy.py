@@ -1,10 +1,88 @@
-import pandas as pd
+import logging
+
+import numpy as np
+
+from _njit import njit, NUMBA_AVAILABLE
+
+logger = logging.getLogger(__name__)
+
+@njit(cache=True)
+def _sma_cross_kernel(prices, short_window, long_window):
+    """Crossover test over a contiguous float64 window of long_window+1 prices."""
+    n = prices.shape[0]
+    # O(1) necessary condition: crossing up means the short-minus-long gap
+    # turned positive this tick, so the short mean must have gained strictly
+    # more than the long mean. Each mean's one-tick gain only involves the
+    # entering and leaving prices — no sums needed to rule most ticks out.
+    gain_short = (prices[n - 1] - prices[n - short_window - 1]) / short_window
+    gain_long = (prices[n - 1] - prices[n - long_window - 1]) / long_window
+    if gain_short <= gain_long:
+        return False, 0.0, 0.0
+    curr_short_sum = 0.0
+    for i in range(n - short_window, n):
+        curr_short_sum += prices[i]
+    curr_long_sum = 0.0
+    for i in range(n - long_window, n):
+        curr_long_sum += prices[i]
+    prev_short_sum = curr_short_sum - prices[n - 1] + prices[n - short_window - 1]
+    prev_long_sum = curr_long_sum - prices[n - 1] + prices[n - long_window - 1]
+    crossed = (prev_short_sum / short_window < prev_long_sum / long_window) and \
+              (curr_short_sum / short_window > curr_long_sum / long_window)
+    return crossed, curr_short_sum / short_window, curr_long_sum / long_window
+
+@njit(cache=True)
+def _breakout_kernel(prices, lookback_period):
+    """Single-pass max over the lookback window, compared with the last price."""
+    n = prices.shape[0]
+    current = prices[n - 1]
+    highest = prices[n - lookback_period]
+    for i in range(n - lookback_period, n - 1):
+        if prices[i] > highest:
+            highest = prices[i]
+    return current > highest, highest
+
+class PriceRing:
+    """
+    Preallocated float64 ring buffer for streaming price history.
+
+    Appending to a Python list and re-converting the tail on every tick
+    allocates per tick; the ring keeps a fixed buffer and hands the signal
+    kernels a contiguous window (a view when the window doesn't wrap).
+    """
+
+    def __init__(self, capacity: int = 64):
+        self._buf = np.empty(capacity, dtype=np.float64)
+        self._idx = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def push(self, price: float):
+        self._buf[self._idx] = price
+        self._idx = (self._idx + 1) % self._buf.shape[0]
+        if self._count < self._buf.shape[0]:
+            self._count += 1
+
+    def window(self, k: int) -> np.ndarray:
+        """Return the most recent k prices, oldest first."""
+        k = min(k, self._count)
+        start = self._idx - k
+        if start >= 0:
+            return self._buf[start:self._idx]
+        return np.concatenate((self._buf[start:], self._buf[:self._idx]))
+
+def _tail_window(price_history, k: int) -> np.ndarray:
+    """Last k prices as a contiguous float64 array, from a list or PriceRing."""
+    if isinstance(price_history, PriceRing):
+        return price_history.window(k)
+    return np.asarray(price_history[-k:], dtype=np.float64)
 
 # --- Strategy A: Buy the Dip using SMA Crossover ---
 def find_sma_buy_signal(price_history: list[float], short_window: int = 10, long_window: int = 20) -> bool:
     """
     Returns True if the short-term SMA has just crossed above the long-term SMA.
-    
+
     Args:
         price_history: A list of recent prices.
         short_window: The lookback period for the short SMA.
@@ -13,24 +91,18 @@ def find_sma_buy_signal(price_history: list[float], short_window: int = 10, long
     if len(price_history) < long_window + 1:
         # Not enough data to compute both SMAs and check for a crossover
         return False
-    
-    # Use pandas to easily calculate SMAs
-    series = pd.Series(price_history)
-    short_sma = series.rolling(window=short_window).mean()
-    long_sma = series.rolling(window=long_window).mean()
-    
-    # The signal is a crossover:
-    # 1. The short SMA was below the long SMA in the previous period.
-    # 2. The short SMA is now above the long SMA in the current period.
-    prev_short = short_sma.iloc[-2]
-    prev_long = long_sma.iloc[-2]
-    curr_short = short_sma.iloc[-1]
-    curr_long = long_sma.iloc[-1]
-    
-    if prev_short < prev_long and curr_short > curr_long:
-        print(f"[ENTRY SIGNAL] SMA Crossover detected! Short SMA ({curr_short:.6f}) crossed above Long SMA ({curr_long:.6f}).")
+
+    # Only the last two values of each SMA matter for a crossover. The numeric
+    # core lives in an njit kernel over a contiguous float64 tail window; the
+    # previous-period sums are derived by swapping the newest price for the
+    # one that left each window — no full rolling pass.
+    window = _tail_window(price_history, long_window + 1)
+    crossed, curr_short, curr_long = _sma_cross_kernel(window, short_window, long_window)
+
+    if crossed:
+        logger.info("[ENTRY SIGNAL] SMA Crossover detected! Short SMA (%.6f) crossed above Long SMA (%.6f).", curr_short, curr_long)
         return True
-        
+
     return False
 
 # --- Strategy B: Buy the Breakout ---
@@ -46,28 +118,64 @@ def find_breakout_buy_signal(price_history: list[float], lookback_period: int =
         # Not enough data to determine a breakout
         return False
 
-    recent_prices = price_history[-lookback_period:]
-    current_price = recent_prices[-1]
-    highest_in_lookback = max(recent_prices[:-1]) # Check against all but the current price
+    recent_prices = _tail_window(price_history, lookback_period)
+    # Check against all but the current price. Without numba the kernel's
+    # loop would run in the interpreter, so fall back to NumPy's SIMD max
+    # reduction over the contiguous slice instead.
+    if NUMBA_AVAILABLE:
+        is_breakout, highest_in_lookback = _breakout_kernel(recent_prices, lookback_period)
+    else:
+        highest_in_lookback = recent_prices[:-1].max()
+        is_breakout = recent_prices[-1] > highest_in_lookback
 
-    if current_price > highest_in_lookback:
-        print(f"[ENTRY SIGNAL] Breakout detected! Current price ({current_price:.6f}) surpassed recent high ({highest_in_lookback:.6f}).")
+    if is_breakout:
+        current_price = recent_prices[-1]
+        logger.info("[ENTRY SIGNAL] Breakout detected! Current price (%.6f) surpassed recent high (%.6f).", current_price, highest_in_lookback)
         return True
-        
+
     return False
 
+# --- Batch variant for backtests/replays ---
+def find_all_sma_signals(prices, short_window: int = 10, long_window: int = 20) -> np.ndarray:
+    """
+    Detects every SMA crossover in a whole price series in one vectorized
+    pass — O(N) via cumulative sums, no per-tick recomputation. Returns a
+    boolean array aligned with prices; live streaming keeps using the
+    incremental find_sma_buy_signal.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    n = prices.shape[0]
+    signals = np.zeros(n, dtype=bool)
+    if n < long_window + 1:
+        return signals
+
+    cs = np.concatenate(([0.0], np.cumsum(prices)))
+    short_sma = (cs[short_window:] - cs[:-short_window]) / short_window
+    long_sma = (cs[long_window:] - cs[:-long_window]) / long_window
+
+    # Align both SMA series to windows ending at index long_window-1 .. n-1,
+    # then a crossover at tick i is the gap turning negative -> positive
+    diff = short_sma[long_window - short_window:] - long_sma
+    signals[long_window:] = (diff[1:] > 0) & (diff[:-1] < 0)
+    return signals
+
 # --- Strategy Chooser ---
+# Table dispatch instead of an if/elif chain: one dict hit per call, and
+# adding a strategy is a single entry here
+_STRATEGIES = {
+    'sma': find_sma_buy_signal,
+    'breakout': find_breakout_buy_signal,
+}
+
 def check_for_entry_signal(price_history: list[float], strategy_type: str = 'sma') -> bool:
     """
     Checks for a buy signal using the specified strategy.
-    
+
     Args:
         price_history: A list of recent prices.
         strategy_type: The strategy to use ('sma' or 'breakout').
     """
-    if strategy_type == 'sma':
-        return find_sma_buy_signal(price_history)
-    elif strategy_type == 'breakout':
-        return find_breakout_buy_signal(price_history)
-    else:
-        return False
\ No newline at end of file
+    strategy = _STRATEGIES.get(strategy_type)
+    if strategy is None:
+        return False
+    return strategy(price_history)
\ No newline at end of file
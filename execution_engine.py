@@ -1,17 +1,24 @@
 from database import Trade
-from datetime import datetime
-import json
+from datetime import datetime, timezone
+import logging
+
+logger = logging.getLogger(__name__)
 
 class ExecutionEngine:
     def __init__(self, portfolio_manager, current_trade_id=None):
         self.portfolio_manager = portfolio_manager
         self.current_trade_id = current_trade_id  # Track active trade
+        self._active_trade = None  # Cached Trade row for the active trade
 
     def execute_buy(self, token_info, sol_to_invest, current_price, strategy_params=None, sentiment_data=None):
         """Execute buy order and create Trade record in database"""
-        if current_price <= 0:
+        # Reject degenerate or unaffordable orders up front, before any
+        # division, log formatting or portfolio bookkeeping is spent on them
+        if current_price <= 0 or sol_to_invest <= 0:
             return 0
-        
+        if self.portfolio_manager.sol_balance < sol_to_invest:
+            return 0
+
         token_address = token_info['address']
         token_symbol = token_info.get('symbol', token_address[:8])
         tokens_received = sol_to_invest / current_price
@@ -33,21 +40,24 @@ class ExecutionEngine:
                 token_address=token_address,
                 token_symbol=token_symbol,
                 status='active',
-                entry_time=datetime.utcnow(),
+                entry_time=datetime.now(timezone.utc),
                 entry_price=current_price,
                 quantity=tokens_received,
                 sol_invested=sol_to_invest,
                 stop_loss_price=strategy_params.get('stop_loss_price') if strategy_params else None,
-                take_profit_tiers=json.dumps(strategy_params.get('take_profit_tiers')) if strategy_params and 'take_profit_tiers' in strategy_params else None,
+                take_profit_tiers=strategy_params.get('take_profit_tiers') if strategy_params else None,
                 highest_price_seen=current_price,
-                initial_sentiment_score=sentiment_data.get('score') if sentiment_data else None,
-                initial_mention_count=sentiment_data.get('mentions') if sentiment_data else None
+                initial_sentiment_score=sentiment_data.score if sentiment_data else None,
+                initial_mention_count=sentiment_data.mentions if sentiment_data else None
             )
             self.portfolio_manager.db_session.add(trade)
-            self.portfolio_manager.db_session.commit()
-            self.portfolio_manager.db_session.refresh(trade)
+            # flush() populates trade.id from the INSERT without ending the
+            # transaction or the SELECT a commit+refresh pair would issue;
+            # the row is committed with the next position write or on close
+            self.portfolio_manager.db_session.flush()
             self.current_trade_id = trade.id
-            print(f"✅ Created Trade #{trade.id} in database")
+            self._active_trade = trade
+            logger.info("✅ Created Trade #%s in database", trade.id)
         
         return tokens_received
 
@@ -71,10 +81,13 @@ class ExecutionEngine:
         
         # Update Trade record in database if exists
         if self.current_trade_id and self.portfolio_manager.wallet_address and self.portfolio_manager.db_session:
-            trade = self.portfolio_manager.db_session.query(Trade).filter(
-                Trade.id == self.current_trade_id
-            ).first()
-            
+            trade = self._active_trade
+            if trade is None or trade.id != self.current_trade_id:
+                # session.get hits the identity map first, so this only
+                # issues SQL when the row isn't already in the session
+                trade = self.portfolio_manager.db_session.get(Trade, self.current_trade_id)
+                self._active_trade = trade
+
             if trade:
                 # Check if position is fully closed
                 position_closed = token_address not in self.portfolio_manager.positions or \
@@ -82,18 +95,20 @@ class ExecutionEngine:
                 
                 if position_closed:
                     trade.status = 'finished'
-                    trade.exit_time = datetime.utcnow()
+                    trade.exit_time = datetime.now(timezone.utc)
                     trade.exit_price = current_price
                     trade.sol_returned = sol_received if not trade.sol_returned else trade.sol_returned + sol_received
                     trade.pnl_sol = trade.sol_returned - trade.sol_invested
                     trade.pnl_percent = ((trade.sol_returned / trade.sol_invested) - 1) * 100 if trade.sol_invested > 0 else 0
                     trade.exit_reason = exit_reason
-                    print(f"✅ Closed Trade #{trade.id} | P&L: {trade.pnl_sol:+.4f} SOL ({trade.pnl_percent:+.2f}%)")
+                    logger.info("✅ Closed Trade #%s | P&L: %+.4f SOL (%+.2f%%)", trade.id, trade.pnl_sol, trade.pnl_percent)
+                    # Only the closing sell pays for a commit; partial-sell
+                    # updates ride along with the next flush/commit
+                    self.portfolio_manager.db_session.commit()
+                    self._active_trade = None
                 else:
-                    # Partial sell - update sol_returned
+                    # Partial sell - update sol_returned in memory only
                     trade.sol_returned = sol_received if not trade.sol_returned else trade.sol_returned + sol_received
-                    print(f"📊 Partial sell for Trade #{trade.id} | Received: {sol_received:.4f} SOL")
-                
-                self.portfolio_manager.db_session.commit()
+                    logger.info("📊 Partial sell for Trade #%s | Received: %.4f SOL", trade.id, sol_received)
         
         return sol_received
\ No newline at end of file
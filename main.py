@@ -1,7 +1,12 @@
 import asyncio
+import logging
 from orchestrator import Orchestrator
 import config
 
+# Trading modules log through the stdlib logger; INFO keeps the familiar
+# console narration, DEBUG additionally prints per-sell portfolio status
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
 async def main():
     """
     The main entry point for the autonomous trading system simulation.
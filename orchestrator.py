@@ -1,9 +1,12 @@
 import asyncio
+import logging
 import config
 from portfolio_manager import PortfolioManager
 from execution_engine import ExecutionEngine
 from strategy_engine import StrategyEngine
-from data_feeder import generate_synthetic_data, stream_data
+from data_feeder import generate_price_path, stream_prices
+
+logger = logging.getLogger(__name__)
 
 class Orchestrator:
     def __init__(self):
@@ -15,30 +18,45 @@ class Orchestrator:
 
     def add_token_to_queue(self, token_symbol):
         """Adds a new 'green-flagged' token to the processing queue."""
-        print(f"\n[ORCHESTRATOR] New token signal received: {token_symbol}. Added to queue.")
+        logger.info("[ORCHESTRATOR] New token signal received: %s. Added to queue.", token_symbol)
         self.token_queue.put_nowait(token_symbol)
 
-    async def _monitor_trade(self, token_symbol, data_df):
+    def stop(self):
+        """Requests shutdown; processed after all already-queued signals."""
+        self.token_queue.put_nowait(None)
+
+    def _maybe_finish(self):
+        # Same auto-shutdown condition the old polling loop checked once a
+        # second: queue drained and no trade being monitored.
+        if self.token_queue.empty() and not self.active_strategies:
+            self.stop()
+
+    async def _monitor_trade(self, token_symbol, prices):
         """Monitors price updates for a single token and executes strategy decisions."""
         strategy = self.active_strategies[token_symbol]
         initial_quantity = self.active_trades[token_symbol]
+        token_info = {'address': token_symbol, 'symbol': token_symbol}
+        # Bind the position dict once: record_buy/record_sell mutate it in
+        # place, and on full close it keeps tokens ~= 0 after being dropped
+        # from the positions map — no per-tick membership test + lookups
+        pos = self.portfolio_manager.positions[token_symbol]
+
+        logger.info("[%s] Starting trade monitoring...", token_symbol)
 
-        print(f"[{token_symbol}] Starting trade monitoring...")
+        # Tick pacing comes from config; 0 streams as fast as the loop runs
+        async for current_price in stream_prices(prices, interval=config.SIM_TICK_INTERVAL):
 
-        async for price_update in stream_data(data_df):
-            current_price = price_update['price']
-            
             # If position is closed, stop monitoring
-            if token_symbol not in self.portfolio_manager.positions:
+            if pos['tokens'] < 1e-9:
                 break
-                
+
             action, sell_portion, reason = strategy.check_for_trade_action(current_price)
-            
+
             if action == 'SELL':
-                print(f"[{token_symbol}] Strategy action: {action} {sell_portion*100}% - Reason: {reason}")
-                
-                remaining_tokens = self.portfolio_manager.positions[token_symbol]['tokens']
-                
+                logger.info("[%s] Strategy action: %s %s%% - Reason: %s", token_symbol, action, sell_portion * 100, reason)
+
+                remaining_tokens = pos['tokens']
+
                 # If it's a stop-loss (sell_portion=1.0), sell all remaining tokens.
                 # Otherwise, sell a portion of the *original* quantity.
                 tokens_to_sell = remaining_tokens if sell_portion == 1.0 else initial_quantity * sell_portion
@@ -46,68 +64,81 @@ class Orchestrator:
                 # Ensure we don't try to sell more than we have
                 tokens_to_sell = min(tokens_to_sell, remaining_tokens)
 
-                self.execution_engine.execute_sell(token_symbol, tokens_to_sell, current_price)
-                
-                # Display status after the trade
-                self.portfolio_manager.display_status({token_symbol: current_price})
+                self.execution_engine.execute_sell(token_info, tokens_to_sell, current_price, reason)
+
+                # The status dump formats every position; skip it (and the
+                # price-dict allocation) unless debug output is wanted
+                if logger.isEnabledFor(logging.DEBUG):
+                    self.portfolio_manager.display_status({token_symbol: current_price})
 
         # --- Cleanup after the trade is fully closed ---
-        print(f"[{token_symbol}] Trade monitoring finished. Position closed.")
+        logger.info("[%s] Trade monitoring finished. Position closed.", token_symbol)
         del self.active_strategies[token_symbol]
         del self.active_trades[token_symbol]
 
     async def run(self):
         """The main loop of the orchestrator."""
-        print("[ORCHESTRATOR] System started. Waiting for token signals...")
+        logger.info("[ORCHESTRATOR] System started. Waiting for token signals...")
         self.portfolio_manager.display_status({})
-        
+
+        # Background write-behind flush so batched DB commits happen off the
+        # trade path even when trading goes quiet
+        flush_task = asyncio.create_task(self.portfolio_manager.flush_periodically())
+
         active_monitoring_tasks = []
 
         while True:
-            # --- Start new trades for tokens in the queue ---
-            if not self.token_queue.empty():
-                token_symbol = await self.token_queue.get()
-                
-                print(f"[ORCHESTRATOR] Processing signal for {token_symbol} from queue.")
-
-                # 1. Calculate investment size
-                sol_to_invest = self.portfolio_manager.sol_balance * config.RISK_PER_TRADE_PERCENT
-                
-                if self.portfolio_manager.sol_balance < sol_to_invest or sol_to_invest < 0.01:
-                    print(f"[{token_symbol}] Skipping trade: Insufficient capital to meet risk profile.")
-                    continue
-
-                # 2. Get data and execute initial buy
-                data_df = generate_synthetic_data(
-                    initial_price=config.SIM_INITIAL_PRICE, 
-                    drift=config.SIM_DRIFT, 
-                    volatility=config.SIM_VOLATILITY, 
-                    time_steps=config.SIM_TIME_STEPS
-                )
-                entry_price = data_df['price'].iloc[0]
-                
-                print(f"[{token_symbol}] Attempting initial buy with {sol_to_invest:.4f} SOL at price {entry_price:.6f}")
-                tokens_bought = self.execution_engine.execute_buy(token_symbol, sol_to_invest, entry_price)
-
-                # 3. If buy successful, create strategy and start monitoring
-                if tokens_bought > 0:
-                    strategy = StrategyEngine(token_symbol, entry_price, tokens_bought)
-                    self.active_strategies[token_symbol] = strategy
-                    self.active_trades[token_symbol] = tokens_bought
-                    
-                    # Create and start the monitoring task
-                    task = asyncio.create_task(self._monitor_trade(token_symbol, data_df))
-                    active_monitoring_tasks.append(task)
-                    self.portfolio_manager.display_status({token_symbol: entry_price})
-                else:
-                    print(f"[{token_symbol}] Initial buy failed. Aborting trade.")
-            
-            # --- Check for completion ---
-            if self.token_queue.empty() and not self.active_strategies:
-                print("\n[ORCHESTRATOR] All trades are complete and queue is empty. Shutting down.")
+            # Block until a signal (or the shutdown sentinel) arrives instead
+            # of polling the queue once a second
+            token_symbol = await self.token_queue.get()
+            if token_symbol is None:
+                logger.info("[ORCHESTRATOR] All trades are complete and queue is empty. Shutting down.")
                 break
 
-            await asyncio.sleep(1) # Check the queue every second
+            logger.info("[ORCHESTRATOR] Processing signal for %s from queue.", token_symbol)
+
+            # 1. Calculate investment size
+            sol_to_invest = self.portfolio_manager.sol_balance * config.RISK_PER_TRADE_PERCENT
+
+            if self.portfolio_manager.sol_balance < sol_to_invest or sol_to_invest < 0.01:
+                logger.info("[%s] Skipping trade: Insufficient capital to meet risk profile.", token_symbol)
+                self._maybe_finish()
+                continue
+
+            # 2. Get data and execute initial buy. The cached path is a plain
+            # float64 array shared between tokens with identical sim params.
+            prices = generate_price_path(
+                config.SIM_INITIAL_PRICE,
+                config.SIM_DRIFT,
+                config.SIM_VOLATILITY,
+                config.SIM_TIME_STEPS
+            )
+            entry_price = float(prices[0])
+
+            logger.info("[%s] Attempting initial buy with %.4f SOL at price %.6f", token_symbol, sol_to_invest, entry_price)
+            # ExecutionEngine keys positions by token address; the simulation
+            # has no real address, so the symbol stands in for both
+            token_info = {'address': token_symbol, 'symbol': token_symbol}
+            tokens_bought = self.execution_engine.execute_buy(token_info, sol_to_invest, entry_price)
+
+            # 3. If buy successful, create strategy and start monitoring
+            if tokens_bought > 0:
+                strategy = StrategyEngine(token_info, entry_price, tokens_bought)
+                self.active_strategies[token_symbol] = strategy
+                self.active_trades[token_symbol] = tokens_bought
+
+                # Create and start the monitoring task; when the last one
+                # completes with the queue drained, it pushes the sentinel
+                task = asyncio.create_task(self._monitor_trade(token_symbol, prices))
+                task.add_done_callback(lambda _t: self._maybe_finish())
+                active_monitoring_tasks.append(task)
+                self.portfolio_manager.display_status({token_symbol: entry_price})
+            else:
+                logger.info("[%s] Initial buy failed. Aborting trade.", token_symbol)
+                self._maybe_finish()
 
         # Wait for any lingering tasks to finish (good practice)
-        await asyncio.gather(*active_monitoring_tasks)
\ No newline at end of file
+        await asyncio.gather(*active_monitoring_tasks)
+
+        flush_task.cancel()
+        self.portfolio_manager.flush()
\ No newline at end of file
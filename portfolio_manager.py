@@ -1,23 +1,59 @@
+import asyncio
+import sys
+from collections import defaultdict, deque
+
 import config
-from collections import defaultdict
+import numpy as np
 from datetime import datetime
+from sqlalchemy import delete
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 from database import Trade, Position, PortfolioSnapshot, SessionLocal
-import json
 
 class PortfolioManager:
     def __init__(self, initial_capital, wallet_address=None, db_session=None):
         self.sol_balance = initial_capital
-        self.positions = defaultdict(lambda: {'tokens': 0, 'cost_basis': 0.0})
-        self.trade_log = []
+        # Plain dict: a defaultdict would silently create empty positions on
+        # read, so misses stay misses and entries only appear via record_buy
+        self.positions = {}
+        # Struct-of-arrays mirror of token quantities: valuation collapses
+        # the per-position Python loop into one dot product. Slots are
+        # assigned per symbol and zeroed (not freed) when a position closes.
+        self._symbol_to_idx = {}
+        self._tokens_arr = np.zeros(16, dtype=np.float64)
+        # Bounded ring: a long-running bot would otherwise grow this forever.
+        # Full trade history lives in the database; this is a recent-activity log.
+        self.trade_log = deque(maxlen=10_000)
         self.wallet_address = wallet_address
         self.db_session = db_session or SessionLocal()
         self.initial_capital = initial_capital
+        # Commit once per batch of writes instead of per trade: each commit
+        # is an fsync, and amortizing it dominates SQLite write throughput
+        self._pending_writes = 0
+        self._commit_every = 16
+        # Memoized portfolio total for ticks where nothing moved. Trades
+        # invalidate it; feeders signal price moves via prices_changed()
+        self._cached_total = None
+        self._cached_prices = None
+        # Running realized P&L per token (SOL in minus SOL out), updated on
+        # each trade — close-out reporting reads it in O(1) instead of
+        # replaying the trade log
+        self._pnl_by_token = defaultdict(float)
         
         # Load existing positions from database if wallet_address provided
         if wallet_address and db_session:
             self._load_positions_from_db()
 
+    def _set_token_slot(self, token_symbol, tokens):
+        """Keeps the SoA quantity array in sync with self.positions."""
+        idx = self._symbol_to_idx.get(token_symbol)
+        if idx is None:
+            idx = len(self._symbol_to_idx)
+            if idx >= self._tokens_arr.shape[0]:
+                self._tokens_arr = np.resize(self._tokens_arr, self._tokens_arr.shape[0] * 2)
+            self._symbol_to_idx[token_symbol] = idx
+        self._tokens_arr[idx] = tokens
+
     def record_buy(self, token_symbol, sol_spent, tokens_received, price):
         """Records a purchase transaction."""
         if self.sol_balance < sol_spent:
@@ -25,20 +61,29 @@ class PortfolioManager:
             return False
         
         self.sol_balance -= sol_spent
-        
-        # Update position
-        current_tokens = self.positions[token_symbol]['tokens']
-        current_cost = self.positions[token_symbol]['cost_basis'] * current_tokens
-        
+
+        # Update position (in place, so holders of the dict see the change)
+        position = self.positions.get(token_symbol)
+        if position is None:
+            position = {'tokens': 0, 'cost_basis': 0.0}
+            self.positions[token_symbol] = position
+
+        current_tokens = position['tokens']
+        current_cost = position['cost_basis'] * current_tokens
+
         new_total_tokens = current_tokens + tokens_received
         new_total_cost = current_cost + sol_spent
-        
-        self.positions[token_symbol]['tokens'] = new_total_tokens
-        self.positions[token_symbol]['cost_basis'] = new_total_cost / new_total_tokens if new_total_tokens > 0 else 0
+
+        position['tokens'] = new_total_tokens
+        position['cost_basis'] = new_total_cost / new_total_tokens if new_total_tokens > 0 else 0
+        self._set_token_slot(token_symbol, new_total_tokens)
+        self._cached_total = None
+        self._pnl_by_token[token_symbol] -= sol_spent
         
         log_entry = f"BUY: {tokens_received:.2f} {token_symbol} at {price:.6f} for {sol_spent:.4f} SOL"
         self.trade_log.append(log_entry)
-        print(log_entry)
+        if config.VERBOSE:
+            print(log_entry)
         
         # Persist to database if wallet_address provided
         if self.wallet_address and self.db_session:
@@ -48,20 +93,26 @@ class PortfolioManager:
 
     def record_sell(self, token_symbol, tokens_sold, sol_received, price):
         """Records a sale transaction."""
-        if self.positions[token_symbol]['tokens'] < tokens_sold:
+        position = self.positions.get(token_symbol)
+        if position is None or position['tokens'] < tokens_sold:
             print("Error: Not enough tokens to sell.")
             return False
-            
+
         self.sol_balance += sol_received
-        self.positions[token_symbol]['tokens'] -= tokens_sold
-        
+        position['tokens'] -= tokens_sold
+        self._set_token_slot(token_symbol, position['tokens'])
+        self._cached_total = None
+        self._pnl_by_token[token_symbol] += sol_received
+
         # If all tokens are sold, remove the position to keep things clean
-        if self.positions[token_symbol]['tokens'] < 1e-9: # Use a small threshold for float comparison
+        if position['tokens'] < 1e-9: # Use a small threshold for float comparison
             del self.positions[token_symbol]
+            self._tokens_arr[self._symbol_to_idx[token_symbol]] = 0.0
 
         log_entry = f"SELL: {tokens_sold:.2f} {token_symbol} at {price:.6f} for {sol_received:.4f} SOL"
         self.trade_log.append(log_entry)
-        print(log_entry)
+        if config.VERBOSE:
+            print(log_entry)
         
         # Persist to database if wallet_address provided
         if self.wallet_address and self.db_session:
@@ -69,41 +120,89 @@ class PortfolioManager:
         
         return True
 
+    def get_token_pnl(self, token_symbol):
+        """Realized P&L for a token so far (SOL received minus SOL spent)."""
+        return self._pnl_by_token[token_symbol]
+
     def get_position_value(self, token_symbol, current_price):
         """Calculates the current SOL value of a token holding."""
-        if token_symbol in self.positions:
-            return self.positions[token_symbol]['tokens'] * current_price
-        return 0.0
+        position = self.positions.get(token_symbol)
+        return position['tokens'] * current_price if position else 0.0
+
+    def prices_changed(self, symbols=None):
+        """Invalidates the memoized total; feeders call this on a price move."""
+        self._cached_total = None
 
     def get_total_value(self, current_prices_dict):
         """Calculates the total portfolio value (SOL + all token holdings)."""
-        total_value = self.sol_balance
-        for token_symbol, position_data in self.positions.items():
-            current_price = current_prices_dict.get(token_symbol, 0)
-            total_value += position_data['tokens'] * current_price
-        return total_value
+        n = len(self._symbol_to_idx)
+        if n == 0:
+            return self.sol_balance
+        # Unchanged-tick fast path: the dict equality check (C-level) guards
+        # callers that rebuild their prices dict every tick, so a stale total
+        # is never served even without a prices_changed() call
+        if self._cached_total is not None and current_prices_dict == self._cached_prices:
+            return self._cached_total
+        prices = np.fromiter(
+            (current_prices_dict.get(symbol, 0.0) for symbol in self._symbol_to_idx),
+            dtype=np.float64, count=n
+        )
+        total = self.sol_balance + float(self._tokens_arr[:n] @ prices)
+        self._cached_prices = dict(current_prices_dict)
+        self._cached_total = total
+        return total
 
     def display_status(self, current_prices_dict):
         """Prints a summary of the current portfolio status."""
-        print("\n--- PORTFOLIO STATUS ---")
-        print(f"SOL Balance: {self.sol_balance:.4f} SOL")
-        print("Holdings:")
+        # Accumulate the report and write it once: one syscall instead of
+        # one per line, which matters when positions are many
+        lines = ["\n--- PORTFOLIO STATUS ---"]
+        lines.append(f"SOL Balance: {self.sol_balance:.4f} SOL")
+        lines.append("Holdings:")
         if not self.positions:
-            print("  None")
+            lines.append("  None")
         for token, pos in self.positions.items():
-            current_value = self.get_position_value(token, current_prices_dict.get(token, 0))
-            pnl = (current_value - (pos['tokens'] * pos['cost_basis']))
-            pnl_percent = (current_prices_dict.get(token, 0) / pos['cost_basis'] - 1) * 100 if pos['cost_basis'] > 0 else 0
-            print(f"  - {token}: {pos['tokens']:.2f} tokens | Avg Cost: {pos['cost_basis']:.6f} | "
-                  f"Current Value: {current_value:.4f} SOL | P&L: {pnl:+.4f} SOL ({pnl_percent:+.2f}%)")
-        
+            # Resolve the price and position fields once per holding
+            price = current_prices_dict.get(token, 0.0)
+            tokens = pos['tokens']
+            cost_basis = pos['cost_basis']
+            current_value = tokens * price
+            pnl = current_value - tokens * cost_basis
+            pnl_percent = (price / cost_basis - 1) * 100 if cost_basis > 0 else 0
+            lines.append(f"  - {token}: {tokens:.2f} tokens | Avg Cost: {cost_basis:.6f} | "
+                         f"Current Value: {current_value:.4f} SOL | P&L: {pnl:+.4f} SOL ({pnl_percent:+.2f}%)")
+
         total_value = self.get_total_value(current_prices_dict)
         initial_capital = config.INITIAL_CAPITAL_SOL
         total_pnl = total_value - initial_capital
         total_pnl_percent = (total_value / initial_capital - 1) * 100
-        print(f"Total Portfolio Value: {total_value:.4f} SOL")
-        print(f"Total P&L: {total_pnl:+.4f} SOL ({total_pnl_percent:+.2f}%)")
-        print("------------------------\n")
+        lines.append(f"Total Portfolio Value: {total_value:.4f} SOL")
+        lines.append(f"Total P&L: {total_pnl:+.4f} SOL ({total_pnl_percent:+.2f}%)")
+        lines.append("------------------------\n")
+        sys.stdout.write('\n'.join(lines) + '\n')
+
+    def _commit_batched(self):
+        """Counts a pending write; commits once per _commit_every writes."""
+        self._pending_writes += 1
+        if self._pending_writes >= self._commit_every:
+            self.db_session.commit()
+            self._pending_writes = 0
+
+    def flush(self):
+        """Commits any batched writes immediately; call on shutdown."""
+        if self._pending_writes:
+            self.db_session.commit()
+            self._pending_writes = 0
+
+    async def flush_periodically(self, interval=1.0):
+        """
+        Write-behind flusher: commits batched writes every `interval` seconds
+        so a quiet stretch can't leave rows pending until the next trade.
+        Run as a background task; cancel it and call flush() on shutdown.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            self.flush()
 
     def _load_positions_from_db(self):
         """Load existing positions from database for this wallet"""
@@ -119,6 +218,7 @@ class PortfolioManager:
                 'tokens': pos.tokens,
                 'cost_basis': pos.cost_basis
             }
+            self._set_token_slot(pos.token_symbol, pos.tokens)
         
         print(f"Loaded {len(db_positions)} positions from database for {self.wallet_address[:8]}...")
 
@@ -127,32 +227,35 @@ class PortfolioManager:
         if not self.wallet_address or not self.db_session:
             return
             
-        # Find existing position or create new
-        db_position = self.db_session.query(Position).filter(
-            Position.wallet_address == self.wallet_address,
-            Position.token_symbol == token_symbol
-        ).first()
-        
-        if token_symbol in self.positions and self.positions[token_symbol]['tokens'] > 1e-9:
-            # Update or create position
-            if db_position:
-                db_position.tokens = self.positions[token_symbol]['tokens']
-                db_position.cost_basis = self.positions[token_symbol]['cost_basis']
-                db_position.last_updated = datetime.utcnow()
-            else:
-                db_position = Position(
-                    wallet_address=self.wallet_address,
-                    token_address=f"unknown_{token_symbol}",  # Token address would need to be passed
-                    token_symbol=token_symbol,
-                    tokens=self.positions[token_symbol]['tokens'],
-                    cost_basis=self.positions[token_symbol]['cost_basis']
-                )
-                self.db_session.add(db_position)
-        elif db_position:
+        position = self.positions.get(token_symbol)
+        if position is not None and position['tokens'] > 1e-9:
+            # One native upsert instead of SELECT-then-UPDATE/INSERT: the
+            # unique (wallet, symbol) index arbitrates the conflict
+            stmt = sqlite_insert(Position).values(
+                wallet_address=self.wallet_address,
+                token_address=f"unknown_{token_symbol}",  # Token address would need to be passed
+                token_symbol=token_symbol,
+                tokens=position['tokens'],
+                cost_basis=position['cost_basis'],
+                last_updated=datetime.utcnow()
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['wallet_address', 'token_symbol'],
+                set_={
+                    'tokens': stmt.excluded.tokens,
+                    'cost_basis': stmt.excluded.cost_basis,
+                    'last_updated': stmt.excluded.last_updated
+                }
+            )
+            self.db_session.execute(stmt)
+        else:
             # Position closed, remove from database
-            self.db_session.delete(db_position)
-        
-        self.db_session.commit()
+            self.db_session.execute(delete(Position).where(
+                Position.wallet_address == self.wallet_address,
+                Position.token_symbol == token_symbol
+            ))
+
+        self._commit_batched()
 
     def save_portfolio_snapshot(self, current_prices_dict):
         """Save current portfolio state as snapshot for historical tracking"""
@@ -170,7 +273,7 @@ class PortfolioManager:
             overall_pnl=overall_pnl
         )
         self.db_session.add(snapshot)
-        self.db_session.commit()
+        self._commit_batched()
 
 # This part is for standalone testing of this file
 if __name__ == '__main__':
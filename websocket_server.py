@@ -2,6 +2,10 @@ import asyncio
 import websockets
 import json
 import random
+import time
+from collections import deque
+
+import numpy as np
 import config
 import aiohttp
 from datetime import datetime, timezone
@@ -9,20 +13,40 @@ from datetime import datetime, timezone
 from portfolio_manager import PortfolioManager
 from execution_engine import ExecutionEngine
 from strategy_engine import StrategyEngine
-from data_feeder import generate_synthetic_data
-from entry_strategy import check_for_entry_signal
+from data_feeder import generate_synthetic_arrays, next_normal
+from entry_strategy import find_all_sma_signals
 from token_metadata import TokenMetadata
 from sentiment_analyzer import check_sentiment
 from database import SessionLocal
 from auth import authenticate_wallet, register_synthetic_wallet
 
 SSE_ENDPOINT = "http://localhost:5000/stream"
+TOKEN_INFO_ENDPOINT = "https://psychic-train-69grw7p65wjjc4vxr-5000.app.github.dev/token"
+
+# Module Generator for the simulated market-trade draws: batch calls on a
+# Generator are faster than the legacy np.random global and don't share
+# state with other modules
+RNG = np.random.default_rng()
+
+# Shared HTTP session for token-info lookups: one connection pool with DNS
+# caching instead of a fresh TCP+TLS handshake per token signal
+_http_session = None
+
+def get_http_session():
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=50, ttl_dns_cache=300)
+        )
+    return _http_session
 
 # Multi-user state management
 USER_STATES = {}  # wallet_address -> APP_STATE
 USER_CONNECTIONS = {}  # wallet_address -> set of websockets
 PORTFOLIO_MANAGERS = {}  # wallet_address -> PortfolioManager
-GLOBAL_MARKET_INDEX = []  # Shared market index data for idle display
+# Shared market index data for idle display; maxlen keeps the window bounded
+# without the O(n) pop(0) shuffle a list would need
+GLOBAL_MARKET_INDEX = deque(maxlen=1000)
 USER_LOCKS = {}  # wallet_address -> asyncio.Lock to serialize trades per user
 
 
@@ -34,13 +58,17 @@ def get_default_state():
     """Return a fresh APP_STATE structure for a new user"""
     return {
         "trade_summaries": [],
+        # token address -> position in trade_summaries; summaries are only
+        # ever appended within a session, so stored positions stay valid and
+        # lookups skip the O(n) scan over the list
+        "summary_index": {},
         "active_token_info": None,
         "initial_candles": [],
         "initial_volumes": [],
-        "bot_trades": [],
+        "bot_trades": deque(maxlen=1000),
         "strategy_state": None,
         "portfolio": None,
-        "market_index_history": [],
+        "market_index_history": deque(maxlen=1000),
         "processed_tokens": set(),
         "loss_tokens": set(),
     }
@@ -74,7 +102,7 @@ async def register(websocket):
             # Initialize user state if not exists
             if wallet_address not in USER_STATES:
                 USER_STATES[wallet_address] = get_default_state()
-                USER_STATES[wallet_address]["market_index_history"] = list(GLOBAL_MARKET_INDEX)
+                USER_STATES[wallet_address]["market_index_history"] = deque(GLOBAL_MARKET_INDEX, maxlen=1000)
                 
             if wallet_address not in PORTFOLIO_MANAGERS:
                 PORTFOLIO_MANAGERS[wallet_address] = PortfolioManager(
@@ -109,7 +137,7 @@ async def register(websocket):
                         'token_info': user_state["active_token_info"],
                         'candles': user_state["initial_candles"],
                         'volumes': user_state["initial_volumes"],
-                        'bot_trades': user_state["bot_trades"],
+                        'bot_trades': list(user_state["bot_trades"]),
                         'strategy_state': user_state["strategy_state"],
                     }
                 }
@@ -121,7 +149,7 @@ async def register(websocket):
                     'type': 'NEW_TRADE_STARTING',
                     'data': {
                         'token_info': {'symbol': 'SOL/USDC', 'address': 'MARKET_INDEX'},
-                        'candles': user_state["market_index_history"],
+                        'candles': list(user_state["market_index_history"]),
                         'volumes': [],
                         'bot_trades': [],
                         'strategy_state': None,
@@ -165,12 +193,11 @@ async def broadcast_to_all(message):
     for wallet_address in list(USER_CONNECTIONS.keys()):
         await broadcast_to_user(wallet_address, message)
 
-def format_candle_and_volume(row):
-    timestamp = int(row['timestamp'].timestamp())
-    candle = {'time': timestamp, 'open': row['open'], 'high': row['high'], 'low': row['low'], 'close': row['close']}
-    volume_color = '#26a69a80' if row['close'] >= row['open'] else '#ef535080'
-    volume = {'time': timestamp, 'value': row['volume'], 'color': volume_color}
-    return candle, volume
+def format_candle_and_volume(epoch_seconds, open_, high, low, close, volume):
+    candle = {'time': epoch_seconds, 'open': open_, 'high': high, 'low': low, 'close': close}
+    volume_color = '#26a69a80' if close >= open_ else '#ef535080'
+    volume_bar = {'time': epoch_seconds, 'value': volume, 'color': volume_color}
+    return candle, volume_bar
 
 async def process_single_token(token_info, wallet_address, index, sentiment_result=None):
     """Process a token trade for a specific user"""
@@ -181,16 +208,18 @@ async def process_single_token(token_info, wallet_address, index, sentiment_resu
     pm = PORTFOLIO_MANAGERS[wallet_address]
     APP_STATE = USER_STATES[wallet_address]
     executor = ExecutionEngine(pm)
-    initial_sol_balance = pm.sol_balance
     initial_capital = pm.initial_capital if hasattr(pm, 'initial_capital') else pm.sol_balance
     print(f"[{token_info['symbol']}] Preparing data and finding entry signal...")
-    data_df = generate_synthetic_data(config.SIM_INITIAL_PRICE, config.SIM_DRIFT, config.SIM_VOLATILITY, config.SIM_TIME_STEPS)
-    price_history, entry_price, entry_index = [], 0.0, -1
-    for i, row in data_df.iterrows():
-        price_history.append(row['close'])
-        if check_for_entry_signal(price_history, 'sma'):
-            entry_price, entry_index = row['close'], i
-            break
+    epoch, opens, highs, lows, closes, volumes = generate_synthetic_arrays(
+        config.SIM_INITIAL_PRICE, config.SIM_DRIFT, config.SIM_VOLATILITY, config.SIM_TIME_STEPS)
+    # One vectorized cumsum pass over the whole series instead of a
+    # per-candle Python loop: the scan no longer stalls the event loop
+    # (and the other users' streams) while hunting for the entry
+    entry_price, entry_index = 0.0, -1
+    signal_hits = np.nonzero(find_all_sma_signals(closes))[0]
+    if signal_hits.size:
+        entry_index = int(signal_hits[0])
+        entry_price = float(closes[entry_index])
     if not entry_price:
         print(f"[{token_info['symbol']}] No entry signal found in dataset. Skipping.")
         APP_STATE["trade_summaries"][index].update({'status': 'Finished', 'pnl': 0.0})
@@ -212,9 +241,10 @@ async def process_single_token(token_info, wallet_address, index, sentiment_resu
     # Get sentiment data from parameter
     sentiment_data = sentiment_result if sentiment_result else None
     
+    pnl_before = pm.get_token_pnl(token_info['address'])
     tokens_bought = executor.execute_buy(token_info, sol_to_invest, entry_price, strategy_params, sentiment_data)
     strategy.initial_token_quantity = tokens_bought
-    bot_trade = {'time': int(data_df.iloc[entry_index]['timestamp'].timestamp()), 'side': 'BUY', 'price': entry_price, 'sol_amount': sol_to_invest, 'token_amount': tokens_bought}
+    bot_trade = {'time': int(epoch[entry_index]), 'side': 'BUY', 'price': entry_price, 'sol_amount': sol_to_invest, 'token_amount': tokens_bought}
     strategy_state = {'entry_price': strategy.entry_price, 'stop_loss_price': strategy.stop_loss_price, 'take_profit_tiers': config.TAKE_PROFIT_TIERS, 'highest_price_seen': strategy.highest_price_seen}
     current_total = pm.get_total_value({token_info['address']: entry_price})
     portfolio_status = {
@@ -224,16 +254,30 @@ async def process_single_token(token_info, wallet_address, index, sentiment_resu
         'trade_pnl': current_total - initial_capital,
         'overall_pnl': current_total - initial_capital
     }
-    APP_STATE.update({ "active_token_info": token_info, "initial_candles": initial_candles, "initial_volumes": initial_volumes, "bot_trades": [bot_trade], "strategy_state": strategy_state, "portfolio": portfolio_status })
+    APP_STATE.update({ "active_token_info": token_info, "initial_candles": initial_candles, "initial_volumes": initial_volumes, "bot_trades": deque([bot_trade], maxlen=1000), "strategy_state": strategy_state, "portfolio": portfolio_status })
     APP_STATE["trade_summaries"][index]['status'] = 'Active'
     await broadcast_to_user(wallet_address, json.dumps({'type': 'TRADE_SUMMARY_UPDATE', 'data': {'summaries': APP_STATE["trade_summaries"]}}))
     new_trade_package = { 'type': 'NEW_TRADE_STARTING', 'data': { 'token_info': token_info, 'candles': initial_candles, 'volumes': initial_volumes, 'bot_trades': [bot_trade], 'strategy_state': strategy_state, 'portfolio': portfolio_status } }
     await broadcast_to_user(wallet_address, json.dumps(new_trade_package))
     await asyncio.sleep(2)
 
-    for i, row in data_df.iloc[entry_index + 1:].iterrows():
+    # Pre-draw the synthetic market-trade randomness for the whole stream in
+    # three vectorized calls instead of 3 scalar RNG calls per tick
+    n_ticks = closes.shape[0] - entry_index - 1
+    mt_mask = RNG.random(n_ticks) > 0.6
+    mt_side = RNG.random(n_ticks) > 0.5
+    mt_amount = np.round(RNG.uniform(0.05, 1.5, n_ticks), 4)
+
+    # Position entries mutate in place, so the positions copy stays current;
+    # only a trade event can add or drop a holding, so it is rebuilt on
+    # those ticks instead of every tick. The portfolio dict built above is
+    # reused with its scalars overwritten per tick.
+    portfolio_payload = portfolio_status
+    positions_payload = portfolio_payload['positions']
+
+    for i in range(entry_index + 1, closes.shape[0]):
         await asyncio.sleep(1)
-        current_price = row['close']
+        current_price = float(closes[i])
         bot_trade_event = None
         if token_info['address'] in pm.positions:
             action, sell_portion, reason = strategy.check_for_trade_action(current_price)
@@ -243,20 +287,23 @@ async def process_single_token(token_info, wallet_address, index, sentiment_resu
                 tokens_to_sell = min(tokens_to_sell, remaining_tokens)
                 sol_received = executor.execute_sell(token_info, tokens_to_sell, current_price, reason)
                 if sol_received > 0:
-                    bot_trade_event = {'time': int(row['timestamp'].timestamp()), 'side': 'SELL', 'price': current_price, 'sol_amount': sol_received, 'token_amount': tokens_to_sell}
+                    bot_trade_event = {'time': int(epoch[i]), 'side': 'SELL', 'price': current_price, 'sol_amount': sol_received, 'token_amount': tokens_to_sell}
                     APP_STATE["bot_trades"].append(bot_trade_event)
         
         APP_STATE["strategy_state"] = {'entry_price': strategy.entry_price, 'stop_loss_price': strategy.stop_loss_price, 'take_profit_tiers': config.TAKE_PROFIT_TIERS, 'highest_price_seen': strategy.highest_price_seen}
         current_total = pm.get_total_value({token_info['address']: current_price})
-        APP_STATE["portfolio"] = {
-            'sol_balance': pm.sol_balance,
-            'positions': {k: v for k, v in pm.positions.items()},
-            'total_value': current_total,
-            'trade_pnl': current_total - initial_capital,
-            'overall_pnl': current_total - initial_capital
-        }
-        market_trade = {'side': 'BUY' if random.random() > 0.5 else 'SELL', 'sol_amount': round(random.uniform(0.05, 1.5), 4), 'price': round(current_price, 6), 'timestamp': datetime.now(timezone.utc).isoformat()} if random.random() > 0.6 else None
-        candle, volume = format_candle_and_volume(row)
+        if bot_trade_event is not None:
+            positions_payload = dict(pm.positions)
+        portfolio_payload['sol_balance'] = pm.sol_balance
+        portfolio_payload['positions'] = positions_payload
+        portfolio_payload['total_value'] = current_total
+        portfolio_payload['trade_pnl'] = current_total - initial_capital
+        portfolio_payload['overall_pnl'] = current_total - initial_capital
+        tick = i - entry_index - 1
+        market_trade = {'side': 'BUY' if mt_side[tick] else 'SELL', 'sol_amount': float(mt_amount[tick]), 'price': round(current_price, 6), 'timestamp': datetime.now(timezone.utc).isoformat()} if mt_mask[tick] else None
+        candle, volume = format_candle_and_volume(
+            int(epoch[i]), float(opens[i]), float(highs[i]), float(lows[i]),
+            current_price, float(volumes[i]))
         # Persist candles/volumes so reconnecting clients get full intratrade history instead of a blank chart
         APP_STATE["initial_candles"].append(candle)
         APP_STATE["initial_volumes"].append(volume)
@@ -271,7 +318,9 @@ async def process_single_token(token_info, wallet_address, index, sentiment_resu
 
     print(f"[{token_info['symbol']}] Trade finished.")
     APP_STATE["trade_summaries"][index]['status'] = 'Finished'
-    APP_STATE["trade_summaries"][index]['pnl'] = pm.sol_balance - initial_sol_balance
+    # Per-token realized P&L counter rather than a balance diff, so the
+    # figure can't be polluted by unrelated balance movement
+    APP_STATE["trade_summaries"][index]['pnl'] = pm.get_token_pnl(token_info['address']) - pnl_before
     # If loss, blacklist this token for this user for the session
     if APP_STATE["trade_summaries"][index]['pnl'] < 0:
         APP_STATE.setdefault("loss_tokens", set()).add(token_info['address'])
@@ -279,43 +328,48 @@ async def process_single_token(token_info, wallet_address, index, sentiment_resu
 
 async def listen_for_tokens(raw_queue: asyncio.Queue, metadata: TokenMetadata):
     print("Starting lean SSE listener...")
+    retry_delay = 1.0
     while True:
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(SSE_ENDPOINT) as response:
-                    if response.status != 200:
-                        print(f"SSE connection failed: {response.status}. Retrying in 10s.")
-                        await asyncio.sleep(10)
-                        continue
-                    async for line in response.content:
-                        line = line.decode('utf-8').strip()
-                        if line.startswith('data:'):
-                            try:
-                                data = json.loads(line[len('data:'):].strip())
-                                token_address = data.get("tokenAddress")
-                                if token_address:
-                                    # Fetch the actual token name from the API
-                                    symbol = token_address[:4] + "..." + token_address[-4:]  # Default fallback
-                                    try:
-                                        async with aiohttp.ClientSession() as token_session:
-                                            token_endpoint = "https://psychic-train-69grw7p65wjjc4vxr-5000.app.github.dev/token"
-                                            async with token_session.get(f"{token_endpoint}/{token_address}", timeout=10) as token_response:
-                                                if token_response.status == 200:
-                                                    content_type = token_response.headers.get('Content-Type', '')
-                                                    if 'application/json' in content_type:
-                                                        token_data = await token_response.json()
-                                                        symbol = token_data.get('symbol', symbol)
-                                                        print(f"Resolved token name: {symbol}")
-                                    except Exception as e:
-                                        print(f"Could not fetch token name for {token_address}: {e}")
-                                    
-                                    token_info = {"address": token_address, "symbol": symbol}
-                                    print(f"Raw signal received for {symbol}. Pushing to screening queue.")
-                                    await raw_queue.put(token_info)
-                            except json.JSONDecodeError: pass
+            # Reuse the shared pooled session: reconnects skip the TCP/TLS
+            # handshake instead of building a fresh session per attempt
+            session = get_http_session()
+            async with session.get(SSE_ENDPOINT) as response:
+                if response.status != 200:
+                    print(f"SSE connection failed: {response.status}. Retrying in {retry_delay:.0f}s.")
+                    await asyncio.sleep(retry_delay)
+                    retry_delay = min(retry_delay * 2, 60) * random.uniform(0.8, 1.2)
+                    continue
+                retry_delay = 1.0
+                async for line in response.content:
+                    line = line.decode('utf-8').strip()
+                    if line.startswith('data:'):
+                        try:
+                            data = json.loads(line[len('data:'):].strip())
+                            token_address = data.get("tokenAddress")
+                            if token_address:
+                                # Fetch the actual token name from the API
+                                symbol = token_address[:4] + "..." + token_address[-4:]  # Default fallback
+                                try:
+                                    token_session = get_http_session()
+                                    async with token_session.get(f"{TOKEN_INFO_ENDPOINT}/{token_address}", timeout=10) as token_response:
+                                        if token_response.status == 200:
+                                            content_type = token_response.headers.get('Content-Type', '')
+                                            if 'application/json' in content_type:
+                                                token_data = await token_response.json()
+                                                symbol = token_data.get('symbol', symbol)
+                                                print(f"Resolved token name: {symbol}")
+                                except Exception as e:
+                                    print(f"Could not fetch token name for {token_address}: {e}")
+
+                                token_info = {"address": token_address, "symbol": symbol}
+                                print(f"Raw signal received for {symbol}. Pushing to screening queue.")
+                                await raw_queue.put(token_info)
+                        except json.JSONDecodeError: pass
         except Exception as e:
-            print(f"Error in SSE listener: {e}. Reconnecting in 10s.")
-            await asyncio.sleep(10)
+            print(f"Error in SSE listener: {e}. Reconnecting in {retry_delay:.0f}s.")
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, 60) * random.uniform(0.8, 1.2)
 
 async def process_sentiment_queue(raw_queue: asyncio.Queue, trade_queue: asyncio.Queue):
     print("Starting sentiment screening processor...")
@@ -335,8 +389,7 @@ async def process_sentiment_queue(raw_queue: asyncio.Queue, trade_queue: asyncio
                 continue
 
             # Also skip if already present in summaries with any status (Active, Pending, Finished, etc.)
-            existing = next((s for s in APP_STATE["trade_summaries"] if s['token']['address'] == token_info['address']), None)
-            if existing:
+            if token_info['address'] in APP_STATE.setdefault("summary_index", {}):
                 continue
 
             new_summary = {
@@ -347,6 +400,7 @@ async def process_sentiment_queue(raw_queue: asyncio.Queue, trade_queue: asyncio
                 'mention_count': None
             }
             APP_STATE["trade_summaries"].append(new_summary)
+            APP_STATE["summary_index"][token_info['address']] = len(APP_STATE["trade_summaries"]) - 1
             APP_STATE["processed_tokens"].add(token_info['address'])
             await broadcast_to_user(wallet_address, json.dumps({'type': 'TRADE_SUMMARY_UPDATE', 'data': {'summaries': APP_STATE["trade_summaries"]}}))
 
@@ -355,86 +409,98 @@ async def process_sentiment_queue(raw_queue: asyncio.Queue, trade_queue: asyncio
         await trade_queue.put((token_info, None))
         await asyncio.sleep(5)
 
+async def _screen_user_for_token(wallet_address, token_info):
+    """Screens one user for a token and kicks off their trade if it passes.
+    Returns True if the user was busy and the token should be requeued."""
+    APP_STATE = USER_STATES[wallet_address]
+    index = APP_STATE.get("summary_index", {}).get(token_info['address'])
+    summary_to_update = APP_STATE["trade_summaries"][index] if index is not None else None
+
+    if not summary_to_update or summary_to_update['status'] != 'Screening':
+        return False
+
+    # If user is busy, defer and requeue this token
+    if user_has_active_or_pending(APP_STATE):
+        return True
+
+    # Run sentiment just-in-time
+    sentiment_result = await check_sentiment(token_info['address'], token_info['symbol'])
+
+    if sentiment_result and sentiment_result.score > 60:
+        if sentiment_result.token_name:
+            token_info['symbol'] = sentiment_result.token_name
+            summary_to_update['token']['symbol'] = sentiment_result.token_name
+        summary_to_update['status'] = 'Pending'
+        summary_to_update['sentiment_score'] = sentiment_result.score
+        summary_to_update['mention_count'] = sentiment_result.mentions
+        await broadcast_to_user(wallet_address, json.dumps({'type': 'TRADE_SUMMARY_UPDATE', 'data': {'summaries': APP_STATE["trade_summaries"]}}))
+
+        # Execute trade for this user with sentiment result (serialized per user)
+        async def run_user_trade():
+            lock = USER_LOCKS.setdefault(wallet_address, asyncio.Lock())
+            async with lock:
+                await process_single_token(token_info, wallet_address, index, sentiment_result)
+
+        asyncio.create_task(run_user_trade())
+    else:
+        summary_to_update['status'] = 'Failed'
+        if sentiment_result:
+            if sentiment_result.token_name:
+                summary_to_update['token']['symbol'] = sentiment_result.token_name
+            summary_to_update['sentiment_score'] = sentiment_result.score
+            summary_to_update['mention_count'] = sentiment_result.mentions
+        await broadcast_to_user(wallet_address, json.dumps({'type': 'TRADE_SUMMARY_UPDATE', 'data': {'summaries': APP_STATE["trade_summaries"]}}))
+    return False
+
+async def _requeue_later(trade_queue, token_info, delay):
+    """Requeues a deferred token after a backoff, off the consumer loop."""
+    await asyncio.sleep(delay)
+    await trade_queue.put((token_info, None))
+
 async def process_trade_queue(trade_queue: asyncio.Queue):
     """Process validated tokens and execute trades for all active users"""
     while True:
         token_info_tuple = await trade_queue.get()
         token_info, _ = token_info_tuple
-        pending_requeue = False
 
-        # Execute trade for ALL active users when they are free; run sentiment right before trading
-        for wallet_address in list(USER_STATES.keys()):
-            APP_STATE = USER_STATES[wallet_address]
-            summary_to_update = next((s for s in APP_STATE["trade_summaries"] if s['token']['address'] == token_info['address']), None)
+        # Screen every user concurrently instead of one await at a time: the
+        # per-token sentiment cache and in-flight lock collapse N users into
+        # a single upstream request, so the fan-out costs one round-trip
+        results = await asyncio.gather(*[
+            _screen_user_for_token(wallet_address, token_info)
+            for wallet_address in list(USER_STATES.keys())
+        ])
 
-            if not summary_to_update or summary_to_update['status'] != 'Screening':
-                continue
-
-            # If user is busy, defer and requeue this token
-            if user_has_active_or_pending(APP_STATE):
-                pending_requeue = True
-                continue
-
-            # Run sentiment just-in-time
-            sentiment_result = await check_sentiment(token_info['address'], token_info['symbol'])
-
-            if sentiment_result and sentiment_result.get('score', 0) > 60:
-                if 'token_name' in sentiment_result:
-                    token_info['symbol'] = sentiment_result['token_name']
-                    summary_to_update['token']['symbol'] = sentiment_result['token_name']
-                summary_to_update['status'] = 'Pending'
-                summary_to_update['sentiment_score'] = sentiment_result['score']
-                summary_to_update['mention_count'] = sentiment_result.get('mentions')
-                index = APP_STATE["trade_summaries"].index(summary_to_update)
-                await broadcast_to_user(wallet_address, json.dumps({'type': 'TRADE_SUMMARY_UPDATE', 'data': {'summaries': APP_STATE["trade_summaries"]}}))
-
-                # Execute trade for this user with sentiment result (serialized per user)
-                async def run_user_trade():
-                    lock = USER_LOCKS.setdefault(wallet_address, asyncio.Lock())
-                    async with lock:
-                        await process_single_token(token_info, wallet_address, index, sentiment_result)
-
-                asyncio.create_task(run_user_trade())
-            else:
-                summary_to_update['status'] = 'Failed'
-                if sentiment_result:
-                    if 'token_name' in sentiment_result:
-                        summary_to_update['token']['symbol'] = sentiment_result['token_name']
-                    summary_to_update['sentiment_score'] = sentiment_result.get('score')
-                    summary_to_update['mention_count'] = sentiment_result.get('mentions')
-                await broadcast_to_user(wallet_address, json.dumps({'type': 'TRADE_SUMMARY_UPDATE', 'data': {'summaries': APP_STATE["trade_summaries"]}}))
-
-        # If any user still needs this token after they free up, requeue it with a short backoff
-        if pending_requeue:
-            await asyncio.sleep(10)
-            await trade_queue.put((token_info, None))
-
-        await asyncio.sleep(5)
+        # If any user still needs this token after they free up, requeue it
+        # with a short backoff — as a task, so the consumer goes straight
+        # back to blocking on get() instead of stalling the whole queue
+        if any(results):
+            asyncio.create_task(_requeue_later(trade_queue, token_info, 10))
 
 async def stream_background_data():
     print("Starting background market data stream...")
-    df = generate_synthetic_data(150, 0.0001, 0.005, 200)
-    for _, row in df.iterrows():
-        candle, _ = format_candle_and_volume(row)
+    epoch, opens, highs, lows, closes, volumes = generate_synthetic_arrays(150, 0.0001, 0.005, 200)
+    for i in range(closes.shape[0]):
+        candle, _ = format_candle_and_volume(
+            int(epoch[i]), float(opens[i]), float(highs[i]), float(lows[i]),
+            float(closes[i]), float(volumes[i]))
         GLOBAL_MARKET_INDEX.append(candle)
     
     while True:
         # Update global market index
         if GLOBAL_MARKET_INDEX:
             last_price = GLOBAL_MARKET_INDEX[-1]['close']
-            new_price = last_price * (1 + random.normalvariate(0.0001, 0.005))
-            new_candle = {'time': int(datetime.now(timezone.utc).timestamp()), 'open': last_price, 'high': max(last_price, new_price), 'low': min(last_price, new_price), 'close': new_price}
+            new_price = last_price * (1 + next_normal(0.0001, 0.005))
+            # time.time() is the same epoch value without constructing a
+            # datetime object per candle
+            new_candle = {'time': int(time.time()), 'open': last_price, 'high': max(last_price, new_price), 'low': min(last_price, new_price), 'close': new_price}
             GLOBAL_MARKET_INDEX.append(new_candle)
-            if len(GLOBAL_MARKET_INDEX) > 1000:
-                GLOBAL_MARKET_INDEX.pop(0)
             
             # Broadcast to users who are idle (no active token)
             for wallet_address in list(USER_STATES.keys()):
                 APP_STATE = USER_STATES[wallet_address]
                 if APP_STATE["active_token_info"] is None:
                     APP_STATE["market_index_history"].append(new_candle)
-                    if len(APP_STATE["market_index_history"]) > 1000:
-                        APP_STATE["market_index_history"].pop(0)
                     await broadcast_to_user(wallet_address, json.dumps({'type': 'UPDATE', 'data': {'candle': new_candle}}))
         
         await asyncio.sleep(2)